@@ -0,0 +1,120 @@
+"""Benchmark distributing an extra amount over a large fund group.
+
+Builds a single fund group with many fixed and open end funds of varied
+remainders and times `FundGroup.distribute_extra_savings` for amounts which
+fill few, about half and nearly all of the funds. With `--check` the amounts
+are compared with those of the previous capping loop, which repeatedly scans
+all funds that are left.
+
+Usage: python benchmarks/distribute_extra.py [--funds N] [--check]
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal, getcontext
+
+from savingfunds.funds import Account, FixedEndFund, FundGroup, OpenEndFund
+from savingfunds.utils import (
+    DECIMAL_PRECISION,
+    dec_round,
+    fix_overdistribution,
+)
+
+
+def build_group(n_funds, seed=0):
+    rng = random.Random(seed)
+    account = Account("account", "Account")
+    group = FundGroup("group", "Group", Decimal(1))
+    today = date(2024, 1, 1)
+
+    for i in range(n_funds):
+        target = Decimal(rng.randrange(1_000, 1_000_000)) / 100
+        balance = dec_round(target * Decimal(rng.random()), 2)
+        if rng.random() < 0.7:
+            target_date = today + timedelta(days=rng.randrange(1, 3_650))
+            fund = FixedEndFund(
+                f"fund-{i}", f"Fund {i}", account, balance, target, target_date
+            )
+        else:
+            days = rng.randrange(30, 3_650)
+            fund = OpenEndFund(
+                f"fund-{i}", f"Fund {i}", account, balance, target, days
+            )
+        group.add_fund(fund)
+
+    return group
+
+
+def legacy_amounts(group, when, amount):
+    """Amounts of the extra distribution with the previous capping loop."""
+    child_dsr = {k: f.daily_saving_rate(when) for k, f in group.funds.items()}
+    amounts = {}
+    funds_left = list(group.funds.keys())
+    while True:
+        remainder_total_dsr = sum([child_dsr[k] for k in funds_left])
+        capping_funds = [
+            k
+            for k in funds_left
+            if amount * child_dsr[k] / remainder_total_dsr
+            >= group.funds[k].remainder_to_save()
+        ]
+
+        for k in capping_funds:
+            amounts[k] = group.funds[k].remainder_to_save()
+            amount -= amounts[k]
+            funds_left.remove(k)
+
+        if len(capping_funds) == 0:
+            break
+
+    remainder_total_dsr = sum([child_dsr[k] for k in funds_left])
+    shares = {
+        k: amount * child_dsr[k] / remainder_total_dsr for k in funds_left
+    }
+    for k in funds_left:
+        amounts[k] = dec_round(shares[k], 2)
+
+    return fix_overdistribution(amounts, amount, funds_left, shares)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--funds", type=int, default=10_000)
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+
+    # Same precision as the command line tool.
+    getcontext().prec = DECIMAL_PRECISION
+
+    when = date(2024, 1, 1)
+    total = build_group(args.funds).remainder_to_save()
+    print(f"{args.funds} funds, € {total:.2f} remaining to save")
+
+    for fraction in ("0.01", "0.5", "0.99"):
+        group = build_group(args.funds)
+        amount = dec_round(total * Decimal(fraction), 2)
+
+        if args.check:
+            expected = legacy_amounts(group, when, amount)
+
+        start = time.perf_counter()
+        amounts, remainder = group.distribute_extra_savings(when, amount)
+        elapsed = time.perf_counter() - start
+
+        capped = sum(1 for f in group.funds.values() if f.balance == f.target)
+        print(
+            f"{fraction:>5} of the remainder: {elapsed:.3f} s"
+            + f", {capped} funds filled"
+        )
+
+        if args.check and amounts != expected:
+            raise SystemExit("Amounts differ from the previous capping loop.")
+
+    if args.check:
+        print("All amounts agree with the previous capping loop.")
+
+
+if __name__ == "__main__":
+    main()
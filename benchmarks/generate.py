@@ -0,0 +1,135 @@
+"""Generate synthetic funds files for benchmarking.
+
+The generated data has the same shape as the data produced by the `to_dict`
+methods of the fund model, so it can be saved with `save_funds_data` and
+loaded by the command line tool.
+
+Usage: python benchmarks/generate.py OUTPUT [--funds N] [--accounts N]
+       [--groups N] [--depth N] [--fixed FRACTION] [--manual FRACTION]
+       [--seed SEED]
+"""
+
+import argparse
+import random
+from datetime import date, timedelta
+from pathlib import Path
+
+
+def generate_funds_data(
+    n_funds=10_000,
+    n_accounts=5,
+    n_groups=10,
+    depth=2,
+    fixed=0.6,
+    manual=0.1,
+    seed=0,
+):
+    """Return (accounts_data, funds_data) with about `n_funds` leaf funds.
+
+    The funds are spread over `n_groups` top level groups, each of which is
+    nested `depth` levels deep. The remaining fraction of funds after the
+    fixed and manual ones are open end funds.
+    """
+    rng = random.Random(seed)
+    today = date(2024, 1, 1)
+
+    accounts_data = [
+        {
+            "key": f"account-{i}",
+            "name": f"Account {i}",
+            "iban": "",
+            "comments": "",
+        }
+        for i in range(n_accounts)
+    ]
+
+    def money(low, high):
+        return f"{rng.randint(low * 100, high * 100) / 100:.2f}"
+
+    def leaf(i):
+        account = f"account-{rng.randrange(n_accounts)}"
+        kind = rng.random()
+        fund = {"key": f"fund-{i}", "name": f"Fund {i}", "account": account}
+        if kind < manual:
+            fund.update(type="manual", balance=money(0, 1000))
+        elif kind < manual + fixed:
+            target_date = today + timedelta(days=rng.randint(-30, 3650))
+            fund.update(
+                type="fixed",
+                balance=money(0, 500),
+                target=money(100, 5000),
+                target_date=target_date.isoformat(),
+            )
+        else:
+            fund.update(
+                type="open",
+                balance=money(0, 500),
+                target=money(100, 5000),
+                days=rng.randint(30, 3650),
+            )
+
+        return fund
+
+    def group(key, level, n):
+        data = {
+            "type": "group",
+            "key": key,
+            "name": key.capitalize(),
+            "funds": [],
+            "monthly-factor": rng.choice(["1", "1.5", "2"]),
+        }
+        if level == depth:
+            data["funds"] = [leaf(next(counter)) for _ in range(n)]
+        else:
+            n_sub = max(1, min(n, rng.randint(2, 4)))
+            for j in range(n_sub):
+                share = n // n_sub + (1 if j < n % n_sub else 0)
+                data["funds"].append(group(f"{key}-{j}", level + 1, share))
+
+        return data
+
+    counter = iter(range(n_funds))
+    funds_data = [
+        group(
+            f"group-{i}",
+            1,
+            n_funds // n_groups + (1 if i < n_funds % n_groups else 0),
+        )
+        for i in range(n_groups)
+    ]
+
+    return accounts_data, funds_data
+
+
+def main():
+    from savingfunds.datasaver import save_funds_data
+    from savingfunds.utils import guess_file_format
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--funds", type=int, default=10_000)
+    parser.add_argument("--accounts", type=int, default=5)
+    parser.add_argument("--groups", type=int, default=10)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--fixed", type=float, default=0.6)
+    parser.add_argument("--manual", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    accounts_data, funds_data = generate_funds_data(
+        args.funds,
+        args.accounts,
+        args.groups,
+        args.depth,
+        args.fixed,
+        args.manual,
+        args.seed,
+    )
+    with open(args.output, "w") as file:
+        save_funds_data(
+            file, accounts_data, funds_data, guess_file_format(args.output)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Guard the import time of the command line entry point.
+
+Runs `python -X importtime -c "import savingfunds.cli"` in a fresh
+interpreter, reports the cumulative import time of the entry point and fails
+when it exceeds the budget or when one of the heavy libraries that should
+only be imported on demand shows up.
+
+Usage: python benchmarks/import_time.py [--budget MICROSECONDS]
+"""
+
+import argparse
+import subprocess
+import sys
+
+DEFERRED_MODULES = ("rich", "schwifty", "yaml")
+
+
+def parse_importtime(output):
+    """Return a dict mapping module names to cumulative import time (us)."""
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+
+        _, cumulative, name = line[len("import time:") :].split("|")
+        try:
+            times[name.strip()] = int(cumulative)
+        except ValueError:
+            # Header line.
+            continue
+
+    return times
+
+
+def measure(runs):
+    best = None
+    for _ in range(runs):
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-c",
+                "import savingfunds.cli",
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        times = parse_importtime(result.stderr)
+        if best is None or times["savingfunds.cli"] < best["savingfunds.cli"]:
+            best = times
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--budget",
+        type=int,
+        default=100_000,
+        help="Maximal cumulative import time in microseconds.",
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    times = measure(args.runs)
+    total = times["savingfunds.cli"]
+    print(f"savingfunds.cli: {total} us (budget {args.budget} us)")
+
+    failed = False
+    for name in DEFERRED_MODULES:
+        if name in times:
+            print(f"'{name}' is imported at startup ({times[name]} us).")
+            failed = True
+
+    if total > args.budget:
+        print("Import time exceeds the budget.")
+        failed = True
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Compare peak memory of loading a YAML funds file with and without streaming.
+
+Loads a generated funds file once by parsing the whole document and then
+converting it to the fund model, and once with the streaming loader which
+creates the accounts and funds while parsing. Reports the peak memory traced
+by tracemalloc and the time of both.
+
+Usage: python benchmarks/load_memory.py [--funds N]
+"""
+
+import argparse
+import gc
+import io
+import time
+import tracemalloc
+
+from generate import generate_funds_data
+
+from savingfunds.dataloader import (
+    convert_data_to_accounts_and_funds,
+    load_funds_data,
+    stream_yaml_accounts_and_funds,
+)
+from savingfunds.datasaver import save_funds_data
+
+
+def load_document(text):
+    data = load_funds_data(io.StringIO(text))
+    return convert_data_to_accounts_and_funds(data)
+
+
+def load_streaming(text):
+    return stream_yaml_accounts_and_funds(io.StringIO(text))
+
+
+def measure(func, text):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(text)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    return current, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--funds", type=int, default=100_000)
+    args = parser.parse_args()
+
+    accounts_data, funds_data = generate_funds_data(args.funds, depth=3)
+    file = io.StringIO()
+    save_funds_data(file, accounts_data, funds_data)
+    text = file.getvalue()
+    del accounts_data, funds_data, file
+
+    print(f"{args.funds} funds, {len(text) / 1e6:.1f} MB of YAML")
+    for name, func in (
+        ("document", load_document),
+        ("streaming", load_streaming),
+    ):
+        current, peak, elapsed = measure(func, text)
+        print(
+            f"{name:>10}: peak {peak / 1e6:7.1f} MB"
+            + f", model {current / 1e6:7.1f} MB, {elapsed:.2f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
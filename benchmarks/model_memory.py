@@ -0,0 +1,49 @@
+"""Measure the memory used by the fund model per fund.
+
+Builds the accounts and funds of a generated tree and reports the memory
+traced by tracemalloc while they are alive, divided by the number of funds.
+The parsed data is freed before measuring, so only the model is counted.
+
+Usage: python benchmarks/model_memory.py [--funds N]
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from generate import generate_funds_data
+
+from savingfunds.dataloader import convert_data_to_accounts_and_funds
+from savingfunds.funds import FundGroup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--funds", type=int, default=100_000)
+    args = parser.parse_args()
+
+    accounts_data, funds_data = generate_funds_data(args.funds, depth=3)
+
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    accounts, funds = convert_data_to_accounts_and_funds(
+        {"accounts": accounts_data, "funds": funds_data}
+    )
+    # The strings of the data are shared with the model, so only the
+    # containers of the data are freed here.
+    del accounts_data, funds_data
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    n_groups = sum(1 for f in funds.iter_funds() if type(f) is FundGroup)
+    size = current - baseline
+    print(f"{args.funds} funds in {n_groups} groups, {len(accounts)} accounts")
+    print(
+        f"model: {size / 1e6:.1f} MB, {size / args.funds:.0f} bytes per fund"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Compare distributions under the Decimal precision of the tool with 100 digits.
+
+For a corpus of generated trees, runs a year of monthly distributions, an
+extra distribution and an interest distribution per account, once with a
+Decimal context of 100 digits and once with `DECIMAL_PRECISION` of
+savingfunds.utils (or `--precision`). Reports the time of both and, with
+`--check`, fails unless all amounts and the saved files are identical.
+
+Usage: python benchmarks/precision.py [--trees N] [--funds N]
+       [--precision DIGITS] [--check]
+"""
+
+import argparse
+import io
+import time
+from datetime import date
+from decimal import Decimal, localcontext
+
+from generate import generate_funds_data
+
+from savingfunds.dataloader import convert_data_to_accounts_and_funds
+from savingfunds.datasaver import save_accounts_and_funds
+from savingfunds.utils import DECIMAL_PRECISION
+
+
+def run_distributions(data):
+    """Return the amounts of all distributions and the saved file."""
+    accounts, funds = convert_data_to_accounts_and_funds(data)
+    results = []
+    for month in range(1, 13):
+        results.append(
+            funds.distribute_monthly_savings_tld(2024, month, Decimal(2500))
+        )
+    when = date(2025, 1, 1)
+    results.append(funds.distribute_extra_savings(when, Decimal("12345.67")))
+    for account in accounts.values():
+        results.append(account.distribute_interest(when, Decimal("98.76")))
+
+    file = io.StringIO()
+    save_accounts_and_funds(file, accounts, funds)
+
+    return results, file.getvalue()
+
+
+def run(data, precision):
+    with localcontext() as ctx:
+        ctx.prec = precision
+        start = time.perf_counter()
+        result = run_distributions(data)
+
+        return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trees", type=int, default=20)
+    parser.add_argument("--funds", type=int, default=300)
+    parser.add_argument("--precision", type=int, default=DECIMAL_PRECISION)
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+
+    totals = {100: 0.0, args.precision: 0.0}
+    differing = 0
+    for seed in range(args.trees):
+        accounts_data, funds_data = generate_funds_data(
+            args.funds, n_groups=4, depth=3, seed=seed
+        )
+        data = {"accounts": accounts_data, "funds": funds_data}
+
+        expected, seconds = run(data, 100)
+        totals[100] += seconds
+        result, seconds = run(data, args.precision)
+        totals[args.precision] += seconds
+
+        if result != expected:
+            differing += 1
+            print(f"Tree {seed}: results differ.")
+
+    for precision, seconds in totals.items():
+        print(f"{precision:>3} digits: {seconds:.2f} s")
+
+    if args.check and differing > 0:
+        raise SystemExit(f"{differing} of {args.trees} trees differ.")
+    if args.check:
+        print(f"All {args.trees} trees give identical results.")
+
+
+if __name__ == "__main__":
+    main()
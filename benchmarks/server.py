@@ -0,0 +1,132 @@
+"""Benchmark commands sent to a server started with `savingfunds serve`.
+
+Generates a funds file, starts a server on it and times deposits and
+monthly-amount requests sent over its socket. With `--check` it also
+verifies that read-only commands leave the funds of the server alone: after
+a simulation and a deposit, only the deposit may show up in the saved file.
+The check runs on a deep tree of 10,000 funds over 50 accounts.
+
+Usage: python benchmarks/server.py [--funds N] [--requests N] [--check]
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from generate import generate_funds_data
+
+from savingfunds.dataloader import load_accounts_and_funds
+from savingfunds.datasaver import write_funds_data_file
+from savingfunds.server import get_socket_path, send_command
+
+
+def start_server(path, save_delay):
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            "from savingfunds.cli import cli; cli()",
+            "--file",
+            str(path),
+            "serve",
+            "--save-delay",
+            str(save_delay),
+        ],
+        stdout=subprocess.DEVNULL,
+    )
+    socket_path = get_socket_path(path)
+    deadline = time.monotonic() + 30
+    while not socket_path.exists():
+        if server.poll() is not None or time.monotonic() > deadline:
+            raise SystemExit("The server did not start.")
+        time.sleep(0.05)
+
+    return server, socket_path
+
+
+def get_fund_key(path):
+    with open(path) as f:
+        _, funds = load_accounts_and_funds(f)
+
+    return next(f.key for f in funds.iter_funds() if f.get_type() != "Group")
+
+
+def load_balance(path, key):
+    with open(path) as f:
+        _, funds = load_accounts_and_funds(f)
+
+    return funds.get_fund_by_key(key).balance
+
+
+def time_requests(socket_path, args, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        exit_code, output = send_command(socket_path, args)
+        if exit_code != 0:
+            raise SystemExit(f"{args[0]} failed: {output}")
+
+    return (time.perf_counter() - start) / n
+
+
+def check_simulate(path):
+    accounts_data, funds_data = generate_funds_data(
+        10_000, n_accounts=50, depth=4
+    )
+    write_funds_data_file(path, accounts_data, funds_data, "yaml")
+    key = get_fund_key(path)
+
+    balance = load_balance(path, key)
+    server, socket_path = start_server(path, 0)
+    try:
+        for args in (
+            ["simulate", "2024", "1", "12", "20000"],
+            ["deposit", key, "1"],
+        ):
+            exit_code, output = send_command(socket_path, args)
+            if exit_code != 0:
+                raise SystemExit(f"{args[0]} failed: {output}")
+    finally:
+        # The server saves its changes when it stops.
+        server.terminate()
+        server.wait()
+
+    if load_balance(path, key) != balance + 1:
+        raise SystemExit("The simulation changed the funds of the server.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--funds", type=int, default=1_000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+
+    accounts_data, funds_data = generate_funds_data(args.funds)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "funds.yaml"
+        write_funds_data_file(path, accounts_data, funds_data, "yaml")
+        key = get_fund_key(path)
+
+        server, socket_path = start_server(path, 1)
+        try:
+            for name, request in (
+                ("deposit", ["deposit", key, "0.01"]),
+                ("monthly-amount", ["monthly-amount", "2024", "3"]),
+            ):
+                seconds = time_requests(socket_path, request, args.requests)
+                print(f"{name:>15}: {seconds * 1000:.3f} ms per request")
+        finally:
+            server.terminate()
+            server.wait()
+
+        if args.check:
+            check_simulate(Path(directory) / "deep.yaml")
+            print("A simulation leaves the funds of the server alone.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Benchmark suite of loading, saving and the main commands.
+
+Generates a funds file and times loading and saving it, and running the
+list-funds, funds-table (also with `--output csv`), distribute-extra,
+distribute-monthly and distribute-interest commands on it in-process. Every
+benchmark runs a number of times on a fresh copy of the file. The results are
+written as JSON, so runs of different releases can be compared.
+
+Usage: python benchmarks/suite.py [--funds N] [--accounts N] [--groups N]
+       [--depth N] [--fixed FRACTION] [--manual FRACTION] [--seed SEED]
+       [--format yaml|json] [--runs N] [--only NAME ...] [--output FILE]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from importlib import metadata
+from pathlib import Path
+
+from generate import generate_funds_data
+
+from savingfunds.cli import cli
+from savingfunds.dataloader import load_accounts_and_funds
+from savingfunds.datasaver import write_funds_data_file, write_funds_file
+
+COMMANDS = {
+    "list-funds": ["list-funds"],
+    "funds-table": ["funds-table"],
+    "funds-table-csv": ["--output", "csv", "funds-table"],
+    "distribute-extra": ["distribute-extra", "--when", "2024-03-01", "5000"],
+    "distribute-monthly": ["distribute-monthly", "2024", "3", "20000"],
+    "distribute-interest": [
+        "distribute-interest",
+        "--when",
+        "2024-03-01",
+        "account-0",
+        "123.45",
+    ],
+}
+
+
+def run_command(path, args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        cli.main(["--file", str(path)] + args, standalone_mode=False)
+
+
+def time_runs(runs, setup, func):
+    times = []
+    for _ in range(runs):
+        arg = setup()
+        start = time.perf_counter()
+        func(arg)
+        times.append(time.perf_counter() - start)
+
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "runs": times,
+    }
+
+
+def get_version():
+    try:
+        return metadata.version("savingfunds")
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--funds", type=int, default=10_000)
+    parser.add_argument("--accounts", type=int, default=5)
+    parser.add_argument("--groups", type=int, default=10)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--fixed", type=float, default=0.6)
+    parser.add_argument("--manual", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=["yaml", "json"], default="yaml")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        choices=["load", "save"] + list(COMMANDS),
+        help="Only run these benchmarks.",
+    )
+    parser.add_argument("--output", type=Path, help="Defaults to stdout.")
+    args = parser.parse_args()
+
+    accounts_data, funds_data = generate_funds_data(
+        args.funds,
+        args.accounts,
+        args.groups,
+        args.depth,
+        args.fixed,
+        args.manual,
+        args.seed,
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        original = Path(directory) / f"original.{args.format}"
+        path = Path(directory) / f"funds.{args.format}"
+        write_funds_data_file(original, accounts_data, funds_data, args.format)
+
+        def fresh_copy():
+            shutil.copyfile(original, path)
+            return path
+
+        def load(path):
+            with open(path) as f:
+                return load_accounts_and_funds(f, args.format)
+
+        def remove_copy():
+            path.unlink(missing_ok=True)
+            return path
+
+        accounts, funds = load(original)
+        benchmarks = {
+            "load": (fresh_copy, load),
+            "save": (
+                remove_copy,
+                lambda p: write_funds_file(p, accounts, funds, args.format),
+            ),
+        }
+        for name, command in COMMANDS.items():
+            benchmarks[name] = (
+                fresh_copy,
+                lambda p, command=command: run_command(p, command),
+            )
+
+        results = {}
+        for name, (setup, func) in benchmarks.items():
+            if args.only is not None and name not in args.only:
+                continue
+
+            results[name] = time_runs(args.runs, setup, func)
+            print(
+                f"{name:>20}: {results[name]['min'] * 1000:9.1f} ms"
+                + f" (median {results[name]['median'] * 1000:.1f} ms)",
+                file=sys.stderr,
+            )
+
+        size = original.stat().st_size
+
+    report = {
+        "savingfunds": get_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "funds": args.funds,
+            "accounts": args.accounts,
+            "groups": args.groups,
+            "depth": args.depth,
+            "fixed": args.fixed,
+            "manual": args.manual,
+            "seed": args.seed,
+            "format": args.format,
+            "runs": args.runs,
+            "file_size": size,
+        },
+        "results": results,
+    }
+
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
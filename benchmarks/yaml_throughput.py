@@ -0,0 +1,56 @@
+"""Compare YAML load and save throughput of the LibYAML and Python backends.
+
+Usage: python benchmarks/yaml_throughput.py [--funds N] [--runs N]
+"""
+
+import argparse
+import io
+import time
+
+import yaml
+
+from generate import generate_funds_data
+
+
+def best_of(runs, func):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--funds", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    accounts_data, funds_data = generate_funds_data(args.funds)
+    data = {"accounts": accounts_data, "funds": funds_data}
+    text = yaml.dump(data, Dumper=yaml.Dumper)
+    size = len(text.encode()) / 1e6
+
+    backends = [("python", yaml.BaseLoader, yaml.Dumper)]
+    if yaml.__with_libyaml__:
+        backends.append(("libyaml", yaml.CBaseLoader, yaml.CDumper))
+    else:
+        print("PyYAML is built without LibYAML.")
+
+    print(f"{args.funds} funds, {size:.1f} MB of YAML")
+    for name, loader, dumper in backends:
+        load = best_of(args.runs, lambda: yaml.load(text, loader))
+        save = best_of(
+            args.runs, lambda: yaml.dump(data, io.StringIO(), dumper)
+        )
+        print(
+            f"{name:>8}: load {load:.3f} s ({size / load:.1f} MB/s), "
+            + f"save {save:.3f} s ({size / save:.1f} MB/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
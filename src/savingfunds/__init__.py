@@ -0,0 +1,4 @@
+import time
+
+# Start of importing the package, reported as the import phase by --timings.
+IMPORT_START = time.perf_counter()
@@ -0,0 +1,407 @@
+"""Local HTTP API with JSON responses over the funds in memory.
+
+The API is served with asyncio from a single event loop. Requests only read
+or change the funds between awaits, so every request sees a consistent state.
+Reads are answered while a change is being saved; changes wait for each
+other with a lock, which is held until their change is saved.
+
+Read endpoints (GET):
+
+    /funds                      all funds, depth first with parent and depth
+    /funds/KEY                  details of a fund
+    /funds-table                the rows of the funds table
+    /accounts                   all accounts with the keys of their funds
+    /accounts/KEY               details of an account
+    /daily-saving-rate          ?when=YYYY-MM-DD&key=KEY, both optional
+    /monthly-amount             ?year=YYYY&month=MM
+
+Changing endpoints (POST) take a JSON object with the parameters of the
+command of the same name:
+
+    /deposit                    {"key", "amount", "increase_target"}
+    /withdraw                   {"key", "amount", "lower_target"}
+    /distribute-extra           {"amount", "when"}
+    /distribute-monthly         {"year", "month", "amount"}
+    /distribute-interest        {"key", "amount", "when"}
+
+Errors are answered with an appropriate status and `{"error": "..."}`.
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+from datetime import date
+from http import HTTPStatus
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from savingfunds.commands.utils import (
+    save_changes,
+    validate_amount,
+    validate_existing_account_key,
+    validate_existing_fund_key,
+    validate_fund_type,
+)
+from savingfunds.funds import BalanceFund, TargetFund
+from savingfunds.reportdata import (
+    account_details,
+    distribution,
+    fund_details,
+    iter_account_rows,
+    iter_fund_tree_rows,
+    iter_funds_table_rows,
+    monthly_amount,
+)
+from savingfunds.utils import moneyfmt
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def check(validate, *args, status=HTTPStatus.BAD_REQUEST):
+    """Run a validator of the commands, raising `ApiError` when it fails."""
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            return validate(*args)
+    except SystemExit:
+        raise ApiError(status, output.getvalue().strip())
+
+
+def get_param(params, name, convert=str, default=None):
+    value = params.get(name)
+    if value is None and default is not None:
+        return default
+    if value is None:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Missing parameter '{name}'.")
+
+    try:
+        return convert(value)
+    except (TypeError, ValueError):
+        raise ApiError(
+            HTTPStatus.BAD_REQUEST, f"Invalid value for parameter '{name}'."
+        )
+
+
+def get_flag(params, name):
+    value = params.get(name, False)
+    if type(value) is not bool:
+        raise ApiError(
+            HTTPStatus.BAD_REQUEST,
+            f"Parameter '{name}' must be true or false.",
+        )
+
+    return value
+
+
+def get_date(params):
+    return get_param(params, "when", date.fromisoformat, date.today())
+
+
+def get_month(params):
+    year = get_param(params, "year", int)
+    month = get_param(params, "month", int)
+    if not 1 <= month <= 12:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "The month must be 1 to 12.")
+
+    return year, month
+
+
+class FundsApi:
+    """HTTP API over the funds and accounts of the context `ctx`."""
+
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.write_lock = None
+        self.read_routes = {
+            "funds": self.get_funds,
+            "funds-table": self.get_funds_table,
+            "accounts": self.get_accounts,
+            "daily-saving-rate": self.get_daily_saving_rate,
+            "monthly-amount": self.get_monthly_amount,
+        }
+        self.write_routes = {
+            "deposit": self.deposit,
+            "withdraw": self.withdraw,
+            "distribute-extra": self.distribute_extra,
+            "distribute-monthly": self.distribute_monthly,
+            "distribute-interest": self.distribute_interest,
+        }
+
+    async def serve(self, host, port, ready=None):
+        """Serve until cancelled, calling `ready` with the bound address."""
+        # Created here, since before Python 3.10 a lock binds to the loop.
+        self.write_lock = asyncio.Lock()
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        async with server:
+            if ready is not None:
+                ready(server.sockets[0].getsockname())
+            await server.serve_forever()
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if request_line == b"":
+                    break
+
+                try:
+                    method, target, version = request_line.decode(
+                        "latin-1"
+                    ).split()
+                    headers = await read_headers(reader)
+                    length = int(headers.get("content-length", "0"))
+                except ValueError:
+                    await write_response(
+                        writer,
+                        HTTPStatus.BAD_REQUEST,
+                        {"error": "Malformed request."},
+                        False,
+                    )
+                    break
+
+                body = await reader.readexactly(length)
+                status, data = await self.respond(method, target, body)
+                keep_alive = (
+                    version == "HTTP/1.1"
+                    and headers.get("connection", "").lower() != "close"
+                )
+                await write_response(writer, status, data, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, method, target, body):
+        url = urlsplit(target)
+        name, *args = [unquote(p) for p in url.path.strip("/").split("/")]
+        try:
+            if name in self.read_routes:
+                if method != "GET":
+                    raise ApiError(
+                        HTTPStatus.METHOD_NOT_ALLOWED, "Use GET to read."
+                    )
+                params = dict(parse_qsl(url.query))
+                return HTTPStatus.OK, self.read_routes[name](args, params)
+
+            if name in self.write_routes and len(args) == 0:
+                if method != "POST":
+                    raise ApiError(
+                        HTTPStatus.METHOD_NOT_ALLOWED, "Use POST to change."
+                    )
+                params = parse_body(body)
+                async with self.write_lock:
+                    funds = self.ctx.obj["FUNDS"]
+                    balances = snapshot_balances(funds)
+                    try:
+                        data = self.write_routes[name](params)
+                        await asyncio.to_thread(save_changes, self.ctx)
+                    except Exception:
+                        # Only keep changes which were saved.
+                        restore_balances(balances)
+                        raise
+                return HTTPStatus.OK, data
+
+            raise ApiError(HTTPStatus.NOT_FOUND, f"No endpoint '{url.path}'.")
+        except ApiError as e:
+            return e.status, {"error": e.args[0]}
+        except Exception as e:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": repr(e)}
+
+    def get_fund(self, key):
+        funds = self.ctx.obj["FUNDS"]
+        check(
+            validate_existing_fund_key, funds, key, status=HTTPStatus.NOT_FOUND
+        )
+
+        return funds.get_fund_by_key(key)
+
+    def get_account(self, key):
+        accounts = self.ctx.obj["ACCOUNTS"]
+        check(
+            validate_existing_account_key,
+            accounts,
+            key,
+            status=HTTPStatus.NOT_FOUND,
+        )
+
+        return accounts[key]
+
+    def get_funds(self, args, params):
+        if len(args) == 1:
+            return fund_details(self.get_fund(args[0]))
+        check_no_args(args)
+
+        return {"funds": list(iter_fund_tree_rows(self.ctx.obj["FUNDS"]))}
+
+    def get_funds_table(self, args, params):
+        check_no_args(args)
+
+        return {"funds": list(iter_funds_table_rows(self.ctx.obj["FUNDS"]))}
+
+    def get_accounts(self, args, params):
+        if len(args) == 1:
+            return account_details(self.get_account(args[0]))
+        check_no_args(args)
+
+        return {"accounts": list(iter_account_rows(self.ctx.obj["ACCOUNTS"]))}
+
+    def get_daily_saving_rate(self, args, params):
+        check_no_args(args)
+        when = get_date(params)
+        fund = self.ctx.obj["FUNDS"]
+        if "key" in params:
+            fund = self.get_fund(params["key"])
+
+        return {
+            "when": when.isoformat(),
+            "daily_saving_rate": moneyfmt(fund.daily_saving_rate(when), 4),
+        }
+
+    def get_monthly_amount(self, args, params):
+        check_no_args(args)
+        year, month = get_month(params)
+
+        return monthly_amount(self.ctx.obj["FUNDS"], year, month)
+
+    def deposit(self, params):
+        fund = self.get_fund(get_param(params, "key"))
+        amount = check(validate_amount, get_param(params, "amount"))
+        increase_target = get_flag(params, "increase_target")
+        check(validate_fund_type, fund, BalanceFund)
+        if increase_target and not isinstance(fund, TargetFund):
+            raise ApiError(
+                HTTPStatus.BAD_REQUEST,
+                f"Fund '{fund.name}' does not have a target.",
+            )
+
+        fund.balance += amount
+        if increase_target:
+            fund.target += amount
+
+        return fund_details(fund)
+
+    def withdraw(self, params):
+        fund = self.get_fund(get_param(params, "key"))
+        amount = check(validate_amount, get_param(params, "amount"))
+        lower_target = get_flag(params, "lower_target")
+        check(validate_fund_type, fund, BalanceFund)
+        if amount > fund.balance:
+            raise ApiError(
+                HTTPStatus.BAD_REQUEST,
+                f"The amount is more than the balance (€ {fund.balance:.2f})."
+                + " You cannot overdraw funds.",
+            )
+        if lower_target and not isinstance(fund, TargetFund):
+            raise ApiError(
+                HTTPStatus.BAD_REQUEST,
+                f"Fund '{fund.name}' does not have a target.",
+            )
+
+        fund.balance -= amount
+        if lower_target:
+            fund.target -= amount
+
+        return fund_details(fund)
+
+    def distribute_extra(self, params):
+        amount = check(validate_amount, get_param(params, "amount"))
+        when = get_date(params)
+        funds = self.ctx.obj["FUNDS"]
+
+        amounts, remainder = funds.distribute_extra_savings(when, amount)
+
+        return self.distribution(amount, remainder, amounts)
+
+    def distribute_monthly(self, params):
+        year, month = get_month(params)
+        amount = check(validate_amount, get_param(params, "amount"))
+        funds = self.ctx.obj["FUNDS"]
+
+        data = monthly_amount(funds, year, month)
+        amounts, remainder, deficit = funds.distribute_monthly_savings_tld(
+            year, month, amount
+        )
+        data.update(self.distribution(amount, remainder, amounts))
+        data["deficit"] = moneyfmt(deficit)
+
+        return data
+
+    def distribute_interest(self, params):
+        account = self.get_account(get_param(params, "key"))
+        amount = check(validate_amount, get_param(params, "amount"))
+        when = get_date(params)
+
+        amounts, remainder = account.distribute_interest(when, amount)
+
+        return self.distribution(amount, remainder, amounts)
+
+    def distribution(self, amount, remainder, amounts):
+        return distribution(
+            self.ctx.obj["FUNDS"],
+            self.ctx.obj["ACCOUNTS"],
+            amount,
+            remainder,
+            amounts,
+        )
+
+
+def snapshot_balances(funds):
+    """The balances and targets of all funds, to undo a failed change."""
+    return [
+        (f, f.balance, f.target if isinstance(f, TargetFund) else None)
+        for f in funds.iter_funds()
+        if isinstance(f, BalanceFund)
+    ]
+
+
+def restore_balances(balances):
+    for fund, balance, target in balances:
+        fund.balance = balance
+        if target is not None:
+            fund.target = target
+
+
+def check_no_args(args):
+    if len(args) > 0:
+        raise ApiError(HTTPStatus.NOT_FOUND, "No such endpoint.")
+
+
+def parse_body(body):
+    try:
+        params = json.loads(body or b"{}")
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "The body is not valid JSON.")
+    if not isinstance(params, dict):
+        raise ApiError(HTTPStatus.BAD_REQUEST, "The body is not an object.")
+
+    return params
+
+
+async def read_headers(reader):
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return headers
+
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+
+async def write_response(writer, status, data, keep_alive):
+    payload = json.dumps(data).encode()
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        + "Content-Type: application/json\r\n"
+        + f"Content-Length: {len(payload)}\r\n"
+        + f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        + "\r\n"
+    )
+    writer.write(head.encode("latin-1") + payload)
+    await writer.drain()
@@ -1,8 +1,16 @@
+import time
 from decimal import getcontext
 from pathlib import Path
 
 import click
 
+from savingfunds import IMPORT_START
+from savingfunds.commands.batch_commands import batch
+from savingfunds.commands.conversion_commands import (
+    compact,
+    export_funds,
+    import_funds,
+)
 from savingfunds.commands.delete_commands import remove_account, remove_fund
 from savingfunds.commands.distribution_commands import (
     distribute_extra,
@@ -40,12 +48,131 @@ from savingfunds.commands.reporting_commands import (
     total_daily_saving_rate,
     monthly_amount,
 )
-from savingfunds.dataloader import load_accounts_and_funds
+from savingfunds.commands.server_commands import (
+    forward_to_server,
+    serve,
+    serve_api,
+)
+from savingfunds.commands.simulation_commands import simulate
+from savingfunds.commands.validation_commands import validate
+from savingfunds.dataloader import (
+    convert_data_to_accounts_and_funds,
+    load_accounts_and_funds,
+    load_funds_data,
+)
+from savingfunds.journal import (
+    accounts_and_funds_to_records,
+    apply_journal,
+    read_journal,
+)
+from savingfunds.locking import lock_funds_file
+from savingfunds.timings import enable_timings, get_timings, phase, timed
+from savingfunds.utils import (
+    DECIMAL_PRECISION,
+    guess_file_format,
+    set_rounding_seed,
+)
+
+getcontext().prec = DECIMAL_PRECISION
+
+READ_ONLY_COMMANDS = [
+    list_accounts,
+    list_funds,
+    funds_table,
+    total_daily_saving_rate,
+    fund_details,
+    account_details,
+    monthly_amount,
+    simulate,
+    validate,
+    export_funds,
+]
+
 
-getcontext().prec = 100
+class ContextObject(dict):
+    """Context object that loads the funds file on first access.
 
+    Commands that never touch the funds or accounts (e.g. `init` or `--help`)
+    therefore do not pay for parsing the file.
+    """
 
-@click.group()
+    def __missing__(self, key):
+        if key not in ("FUNDS", "ACCOUNTS", "RECORDS", "JOURNAL_LENGTH"):
+            raise KeyError(key)
+
+        self.load()
+
+        return self[key]
+
+    @timed("load")
+    def load(self):
+        path = self["PATH"]
+        with phase("lock"):
+            self.lock()
+        if path.exists():
+            with phase("journal"):
+                try:
+                    entries = read_journal(path)
+                except ValueError as e:
+                    click.echo(e.args[0])
+                    raise SystemExit(1)
+            if len(entries) == 0:
+                # Without journal the objects can be built while parsing.
+                with phase("parse"), open(path, "r") as f:
+                    accounts, funds = load_accounts_and_funds(
+                        f, self["FORMAT"]
+                    )
+            else:
+                with phase("parse"), open(path, "r") as f:
+                    data = load_funds_data(f, self["FORMAT"])
+                with phase("journal"):
+                    apply_journal(data, entries)
+                accounts, funds = convert_data_to_accounts_and_funds(data)
+
+            self["FUNDS"] = funds
+            self["ACCOUNTS"] = accounts
+            self["JOURNAL_LENGTH"] = len(entries)
+        else:
+            self["FUNDS"] = {}
+            self["ACCOUNTS"] = {}
+            self["JOURNAL_LENGTH"] = 0
+
+        # The records are the baseline to determine the changes to journal.
+        self["RECORDS"] = None
+        if self["JOURNAL"] and path.exists():
+            self["RECORDS"] = accounts_and_funds_to_records(
+                self["ACCOUNTS"], self["FUNDS"]
+            )
+
+    def lock(self):
+        # Hold the lock from loading until the command has saved its changes.
+        if "LOCK" in self:
+            return
+        try:
+            self["LOCK"] = lock_funds_file(
+                self["PATH"], self["EXCLUSIVE_LOCK"], self["LOCK_TIMEOUT"]
+            )
+        except TimeoutError as e:
+            click.echo(e.args[0])
+            raise SystemExit(1)
+
+    def close(self):
+        if "LOCK" in self:
+            self.pop("LOCK").close()
+
+
+class ServerGroup(click.Group):
+    """Group running the command on a server given with `--server`."""
+
+    def resolve_command(self, ctx, args):
+        name, command, args = super().resolve_command(ctx, args)
+        if ctx.params["server"] is not None:
+            command = forward_to_server
+
+        return name, command, args
+
+
+@click.group(cls=ServerGroup)
 @click.option(
     "--file",
     default="./funds.yaml",
@@ -57,25 +184,129 @@ getcontext().prec = 100
     is_flag=True,
     help="Run the command without saving the changes.",
 )
+@click.option(
+    "--format",
+    "file_format",
+    type=click.Choice(["yaml", "json"]),
+    help="The format of the file. Defaults to guessing from the extension.",
+)
+@click.option(
+    "--journal",
+    is_flag=True,
+    help="Append the changes to a journal instead of rewriting the file.",
+)
+@click.option(
+    "--compact-after",
+    default=100,
+    type=click.IntRange(min=1),
+    show_default=True,
+    help="Number of journal entries after which the journal is compacted.",
+)
+@click.option(
+    "--backups",
+    default=0,
+    type=click.IntRange(min=0),
+    help="Number of backups of the file to keep when it is rewritten.",
+)
+@click.option(
+    "--lock-timeout",
+    default=30.0,
+    type=click.FloatRange(min=0),
+    show_default=True,
+    help="Seconds to wait for other invocations using the file.",
+)
+@click.option(
+    "--seed",
+    type=click.INT,
+    help="Correct rounding differences randomly with this seed instead of "
+    + "with the largest remainder method.",
+)
+@click.option(
+    "--timings",
+    is_flag=True,
+    envvar="SAVINGFUNDS_TIMINGS",
+    help="Print the time spent in the phases of the command.",
+)
+@click.option(
+    "--profile",
+    "profile_file",
+    type=click.Path(dir_okay=False),
+    envvar="SAVINGFUNDS_PROFILE",
+    help="Write cProfile statistics of the command to this file.",
+)
+@click.option(
+    "--output",
+    "output_format",
+    type=click.Choice(["json", "csv", "ndjson"]),
+    help="Write reports in this format instead of rendering them.",
+)
+@click.option(
+    "--server",
+    type=click.Path(dir_okay=False),
+    envvar="SAVINGFUNDS_SERVER",
+    help="Run the command on the server listening on this socket. The "
+    + "other options are those the server was started with.",
+)
 @click.pass_context
-def cli(ctx, file, dry_run):
-    ctx.ensure_object(dict)
+def cli(
+    ctx,
+    file,
+    dry_run,
+    file_format,
+    journal,
+    compact_after,
+    backups,
+    lock_timeout,
+    seed,
+    timings,
+    profile_file,
+    output_format,
+    server,
+):
+    ctx.ensure_object(ContextObject)
 
-    path = Path(file)
+    if timings:
+        enable_timings().add("import", time.perf_counter() - IMPORT_START)
+        ctx.call_on_close(print_timings)
+    if profile_file is not None:
+        import cProfile
 
-    if path.exists():
-        with open(path, "r") as f:
-            accounts, funds = load_accounts_and_funds(f)
+        profiler = cProfile.Profile()
+        ctx.call_on_close(lambda: profiler.dump_stats(profile_file))
+        ctx.call_on_close(profiler.disable)
+        profiler.enable()
 
-        ctx.obj["FUNDS"] = funds
-        ctx.obj["ACCOUNTS"] = accounts
-    else:
-        ctx.obj["FUNDS"] = {}
-        ctx.obj["ACCOUNTS"] = {}
+    path = Path(file)
+    if file_format is None:
+        file_format = guess_file_format(path)
 
     ctx.obj["PATH"] = path
+    ctx.obj["FORMAT"] = file_format
+    ctx.obj["JOURNAL"] = journal
+    ctx.obj["COMPACT_AFTER"] = compact_after
+    ctx.obj["BACKUPS"] = backups
+    ctx.obj["BATCH"] = False
+    ctx.obj["SERVER"] = server
+    ctx.obj["OUTPUT"] = output_format
+
+    # Read-only commands can share the file with other invocations.
+    command = None
+    if ctx.invoked_subcommand is not None:
+        command = ctx.command.get_command(ctx, ctx.invoked_subcommand)
+    ctx.obj["EXCLUSIVE_LOCK"] = not (dry_run or command in READ_ONLY_COMMANDS)
+    ctx.obj["LOCK_TIMEOUT"] = lock_timeout
+    ctx.call_on_close(ctx.obj.close)
     ctx.obj["DRY_RUN"] = dry_run
 
+    set_rounding_seed(seed)
+
+    # Closed before the callbacks above, when the command has finished.
+    ctx.with_resource(phase("command"))
+
+
+def print_timings():
+    click.echo(get_timings().report(), err=True)
+
 
 cli.add_command(list_accounts)
 cli.add_command(list_funds)
@@ -84,6 +315,7 @@ cli.add_command(total_daily_saving_rate)
 cli.add_command(fund_details)
 cli.add_command(account_details)
 cli.add_command(monthly_amount)
+cli.add_command(validate)
 
 cli.add_command(init)
 cli.add_command(new_account)
@@ -113,3 +345,12 @@ cli.add_command(withdraw)
 cli.add_command(distribute_extra)
 cli.add_command(distribute_interest)
 cli.add_command(distribute_monthly)
+
+cli.add_command(batch)
+cli.add_command(serve)
+cli.add_command(serve_api)
+cli.add_command(simulate)
+
+cli.add_command(export_funds)
+cli.add_command(import_funds)
+cli.add_command(compact)
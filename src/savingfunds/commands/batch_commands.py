@@ -0,0 +1,187 @@
+import contextlib
+import csv
+import io
+import json
+from collections import Counter
+
+import click
+
+from savingfunds.commands.delete_commands import remove_account, remove_fund
+from savingfunds.commands.distribution_commands import (
+    distribute_extra,
+    distribute_interest,
+    distribute_monthly,
+)
+from savingfunds.commands.edit_commands import (
+    change_account,
+    change_comments,
+    change_iban,
+    change_monthly_factor,
+    change_parent_group,
+    change_saving_days,
+    change_target,
+    change_target_date,
+    rename_account,
+    rename_fund,
+    set_balance,
+)
+from savingfunds.commands.money_commands import deposit, withdraw
+from savingfunds.commands.new_commands import (
+    new_account,
+    new_fixed_end_fund,
+    new_fund_group,
+    new_manual_fund,
+    new_open_end_fund,
+)
+from savingfunds.commands.utils import save_changes
+
+BATCH_COMMANDS = {
+    c.name: c
+    for c in [
+        deposit,
+        withdraw,
+        set_balance,
+        change_target,
+        change_target_date,
+        change_saving_days,
+        rename_fund,
+        rename_account,
+        change_monthly_factor,
+        change_account,
+        change_parent_group,
+        change_iban,
+        change_comments,
+        new_account,
+        new_fund_group,
+        new_fixed_end_fund,
+        new_open_end_fund,
+        new_manual_fund,
+        remove_account,
+        remove_fund,
+        distribute_extra,
+        distribute_interest,
+        distribute_monthly,
+    ]
+}
+
+
+def read_csv_operations(file):
+    """Yield (command, args) for every row `command,arg,...` of the file."""
+    for row in csv.reader(file):
+        if len(row) == 0 or row[0].strip() == "" or row[0].startswith("#"):
+            continue
+        yield row[0].strip(), row[1:]
+
+
+def read_jsonl_operations(file):
+    """Yield (command, args) for every JSON object on a line of the file.
+
+    Besides `command`, the keys of an object are the parameter names of the
+    command, e.g. `{"command": "deposit", "key": "car", "amount": "10"}`.
+    """
+    for i, line in enumerate(file, 1):
+        if line.strip() == "":
+            continue
+
+        try:
+            operation = json.loads(line)
+        except ValueError:
+            raise click.UsageError(f"Line {i} is not valid JSON.")
+        if not isinstance(operation, dict):
+            raise click.UsageError(f"Line {i} is not a JSON object.")
+        name = operation.pop("command", None)
+        if not isinstance(name, str):
+            raise click.UsageError(f"Missing command on line {i}.")
+        if name not in BATCH_COMMANDS:
+            yield name, []
+            continue
+
+        yield name, operation_args(BATCH_COMMANDS[name], operation)
+
+
+def operation_args(command, operation):
+    """Command line arguments of `command` for the parameters `operation`."""
+    args = []
+    params = {p.name: p for p in command.params}
+    for k, v in operation.items():
+        if k not in params:
+            raise click.UsageError(
+                f"Unknown parameter '{k}' for {command.name}."
+            )
+
+        param = params[k]
+        if isinstance(param, click.Argument):
+            args.append(str(v))
+        elif param.is_flag:
+            if type(v) is not bool:
+                raise click.UsageError(
+                    f"Parameter '{k}' of {command.name} must be true or false."
+                )
+            if v:
+                args.append(param.opts[0])
+        else:
+            args.extend([param.opts[0], str(v)])
+
+    return args
+
+
+@click.command()
+@click.argument("source", type=click.File("r"), default="-")
+@click.option(
+    "--input-format",
+    type=click.Choice(["csv", "jsonl"]),
+    help="Format of the operations. Defaults to guessing from the extension.",
+)
+@click.option("--quiet", is_flag=True, help="Only print the summary.")
+@click.pass_context
+def batch(ctx, source, input_format, quiet):
+    """Apply many operations and save once.
+
+    Every operation is a command with its arguments, either as a CSV row or
+    as a JSON object per line. Either all operations are applied or, when one
+    of them fails, none of them are saved.
+    """
+    if input_format is None:
+        is_jsonl = source.name.endswith((".jsonl", ".ndjson"))
+        input_format = "jsonl" if is_jsonl else "csv"
+
+    match input_format:
+        case "csv":
+            operations = read_csv_operations(source)
+        case "jsonl":
+            operations = read_jsonl_operations(source)
+
+    counts = Counter()
+    n = 1
+    ctx.obj["BATCH"] = True
+    try:
+        for name, args in operations:
+            if name not in BATCH_COMMANDS:
+                raise click.UsageError(f"Unknown command '{name}'.")
+
+            command = BATCH_COMMANDS[name]
+            output = contextlib.nullcontext()
+            if quiet:
+                output = contextlib.redirect_stdout(io.StringIO())
+            with output:
+                with command.make_context(name, args, parent=ctx) as sub_ctx:
+                    command.invoke(sub_ctx)
+
+            counts[name] += 1
+            n += 1
+    except (click.ClickException, SystemExit, ValueError) as e:
+        if isinstance(e, click.ClickException):
+            click.echo(e.format_message())
+        elif isinstance(e, ValueError):
+            click.echo(f"Invalid operation: {e.args[0]}")
+        click.echo(f"Operation {n} failed. No changes were saved.")
+        raise SystemExit(1)
+    finally:
+        ctx.obj["BATCH"] = False
+
+    save_changes(ctx)
+
+    total = sum(counts.values())
+    print(f"Applied {total} operations:")
+    for name, count in counts.items():
+        print(f"  {name}: {count}")
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import click
+
+from savingfunds.dataloader import load_accounts_and_funds
+from savingfunds.datasaver import write_funds_file
+from savingfunds.utils import guess_file_format
+
+
+@click.command("export")
+@click.argument("output", type=click.Path())
+@click.option(
+    "--to",
+    "file_format",
+    type=click.Choice(["yaml", "json"]),
+    help="The format to export to. Defaults to guessing from the extension.",
+)
+@click.pass_context
+def export_funds(ctx, output, file_format):
+    """Export the funds and accounts to another file."""
+    output = Path(output)
+    if file_format is None:
+        file_format = guess_file_format(output)
+
+    accounts = ctx.obj["ACCOUNTS"]
+    funds = ctx.obj["FUNDS"]
+
+    write_funds_file(output, accounts, funds, file_format)
+
+    print(f"Exported funds and accounts to '{output}'.")
+
+
+@click.command("import")
+@click.argument("source", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--from",
+    "file_format",
+    type=click.Choice(["yaml", "json"]),
+    help="The format to import from. Defaults to guessing from the extension.",
+)
+@click.pass_context
+def import_funds(ctx, source, file_format):
+    """Import the funds and accounts from another file."""
+    source = Path(source)
+    if file_format is None:
+        file_format = guess_file_format(source)
+
+    with open(source, "r") as file:
+        accounts, funds = load_accounts_and_funds(file, file_format)
+
+    if not ctx.obj["DRY_RUN"]:
+        # Nothing is loaded, so lock before replacing the file and journal.
+        ctx.obj.lock()
+        write_funds_file(
+            ctx.obj["PATH"],
+            accounts,
+            funds,
+            ctx.obj["FORMAT"],
+            ctx.obj["BACKUPS"],
+        )
+
+    print(f"Imported funds and accounts from '{source}'.")
+
+
+@click.command()
+@click.pass_context
+def compact(ctx):
+    """Compact the journal into the funds file."""
+    accounts = ctx.obj["ACCOUNTS"]
+    funds = ctx.obj["FUNDS"]
+    entries = ctx.obj["JOURNAL_LENGTH"]
+
+    if not ctx.obj["DRY_RUN"]:
+        write_funds_file(
+            ctx.obj["PATH"],
+            accounts,
+            funds,
+            ctx.obj["FORMAT"],
+            ctx.obj["BACKUPS"],
+        )
+
+    print(f"Compacted {entries} journal entries into '{ctx.obj['PATH']}'.")
@@ -1,10 +1,11 @@
 import click
 
 from savingfunds.commands.utils import (
+    save_changes,
     validate_existing_account_key,
     validate_existing_fund_key,
 )
-from savingfunds.datasaver import save_accounts_and_funds
+from savingfunds.funds import AccountFund
 
 
 @click.command()
@@ -16,17 +17,17 @@ def remove_fund(ctx, key):
 
     validate_existing_fund_key(funds, key)
 
+    fund = funds.get_fund_by_key(key)
     try:
         funds.remove_fund_by_key(key)
     except Exception as e:
         print(e.args[0])
         raise SystemExit(1)
 
-    if not ctx.obj["DRY_RUN"]:
-        path = ctx.obj["PATH"]
-        accounts = ctx.obj["ACCOUNTS"]
-        with open(path, "w") as file:
-            save_accounts_and_funds(file, accounts, funds)
+    if isinstance(fund, AccountFund):
+        fund.account.funds.pop(key)
+
+    save_changes(ctx)
 
     print(f"Removed fund with key '{key}'.")
 
@@ -49,10 +50,6 @@ def remove_account(ctx, key):
 
     del accounts[key]
 
-    if not ctx.obj["DRY_RUN"]:
-        path = ctx.obj["PATH"]
-        funds = ctx.obj["FUNDS"]
-        with open(path, "w") as file:
-            save_accounts_and_funds(file, accounts, funds)
+    save_changes(ctx)
 
     print(f"Removed account with key '{key}'.")
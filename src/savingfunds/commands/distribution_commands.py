@@ -2,24 +2,26 @@ from datetime import date
 from decimal import Decimal
 
 import click
-from rich.markdown import Markdown
 
+from savingfunds import reportdata
 from savingfunds.commands.utils import (
+    save_changes,
     validate_amount,
     validate_existing_account_key,
 )
-from savingfunds.datasaver import save_accounts_and_funds
-from savingfunds.reporting import (
-    print_savings_amounts_as_tree,
-    print_savings_report,
-)
+from savingfunds.output import write_report
 from savingfunds.utils import moneyfmt
 
 
+def write_distribution_report(ctx, report):
+    rows = reportdata.iter_distribution_rows(report)
+    write_report(ctx.obj["OUTPUT"], report, rows)
+
+
 @click.command()
 @click.option(
     "--when",
-    default=date.today().isoformat(),
+    default=lambda: date.today().isoformat(),
     type=click.DateTime(["%Y-%m-%d"]),
 )
 @click.argument("amount", type=click.STRING)
@@ -34,28 +36,37 @@ def distribute_extra(ctx, when, amount):
 
     amounts, remainder = funds.distribute_extra_savings(when, amount)
 
+    accounts = ctx.obj["ACCOUNTS"]
+    if ctx.obj["OUTPUT"] is not None:
+        report = reportdata.distribution(
+            funds, accounts, amount, remainder, amounts
+        )
+        write_distribution_report(ctx, report)
+        save_changes(ctx)
+        return
+
+    from rich.markdown import Markdown
+
+    from savingfunds.reporting import print_savings_report
+
     markdown = f"""
 Distributing extra amount: € {amount:.2f}
 
 Remaining amount: € {remainder:.2f}
 """
 
-    accounts = ctx.obj["ACCOUNTS"]
     if amount != remainder:
         print_savings_report(accounts, funds, amounts, Markdown(markdown))
     else:
         print("No funds to fill!")
 
-    if not ctx.obj["DRY_RUN"]:
-        path = ctx.obj["PATH"]
-        with open(path, "w") as file:
-            save_accounts_and_funds(file, accounts, funds)
+    save_changes(ctx)
 
 
 @click.command()
 @click.option(
     "--when",
-    default=date.today().isoformat(),
+    default=lambda: date.today().isoformat(),
     type=click.DateTime(["%Y-%m-%d"]),
 )
 @click.argument("key", type=click.STRING)
@@ -75,6 +86,16 @@ def distribute_interest(ctx, when, key, amount):
     amounts, remainder = account.distribute_interest(when, amount)
 
     funds = ctx.obj["FUNDS"]
+    if ctx.obj["OUTPUT"] is not None:
+        report = reportdata.distribution(
+            funds, {key: account}, amount, remainder, amounts
+        )
+        write_distribution_report(ctx, report)
+        save_changes(ctx)
+        return
+
+    from savingfunds.reporting import print_savings_amounts_as_tree
+
     if remainder != amount:
         print(f"Distributing interest of account '{account.name}' as follows:")
         print_savings_amounts_as_tree(funds, amounts)
@@ -83,10 +104,7 @@ def distribute_interest(ctx, when, key, amount):
 
     print(f"Remaining interest: € {remainder:.2f}.")
 
-    if not ctx.obj["DRY_RUN"]:
-        path = ctx.obj["PATH"]
-        with open(path, "w") as file:
-            save_accounts_and_funds(file, accounts, funds)
+    save_changes(ctx)
 
 
 @click.command()
@@ -100,6 +118,25 @@ def distribute_monthly(ctx, year, month, amount):
 
     funds = ctx.obj["FUNDS"]
 
+    if ctx.obj["OUTPUT"] is not None:
+        report = reportdata.monthly_amount(funds, year, month)
+        amounts, remainder, deficit = funds.distribute_monthly_savings_tld(
+            year, month, amount
+        )
+        report.update(
+            reportdata.distribution(
+                funds, ctx.obj["ACCOUNTS"], amount, remainder, amounts
+            )
+        )
+        report["deficit"] = moneyfmt(deficit)
+        write_distribution_report(ctx, report)
+        save_changes(ctx)
+        return
+
+    from rich.markdown import Markdown
+
+    from savingfunds.reporting import print_savings_report
+
     minimal_monthly_amounts = {
         f: f.get_minimal_monthly_amount(year, month)
         for f in funds.funds.values()
@@ -133,7 +170,4 @@ Minimal monthly amount per tranche:
     accounts = ctx.obj["ACCOUNTS"]
     print_savings_report(accounts, funds, amounts, Markdown(markdown))
 
-    if not ctx.obj["DRY_RUN"]:
-        path = ctx.obj["PATH"]
-        with open(path, "w") as file:
-            save_accounts_and_funds(file, accounts, funds)
+    save_changes(ctx)
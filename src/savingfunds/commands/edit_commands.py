@@ -1,16 +1,15 @@
 from decimal import Decimal
 
 import click
-from schwifty import IBAN
-from schwifty.exceptions import SchwiftyException
 
 from savingfunds.commands.utils import (
+    save_changes,
     validate_amount,
     validate_existing_account_key,
     validate_existing_fund_key,
     validate_fund_type,
+    validate_iban,
 )
-from savingfunds.datasaver import save_accounts_and_funds
 from savingfunds.funds import (
     AccountFund,
     BalanceFund,
@@ -39,11 +38,7 @@ def set_balance(ctx, key, balance):
 
     fund.balance = balance
 
-    if not ctx.obj["DRY_RUN"]:
-        path = ctx.obj["PATH"]
-        accounts = ctx.obj["ACCOUNTS"]
-        with open(path, "w") as file:
-            save_accounts_and_funds(file, accounts, funds)
+    save_changes(ctx)
 
     print(f"Set balance of fund '{fund.name}' to € {balance:.2f}.")
 
@@ -62,11 +57,7 @@ def rename_fund(ctx, key, name):
     old_name = fund.name
     fund.name = name
 
-    if not ctx.obj["DRY_RUN"]:
-        path = ctx.obj["PATH"]
-        accounts = ctx.obj["ACCOUNTS"]
-        with open(path, "w") as file:
-            save_accounts_and_funds(file, accounts, funds)
+    save_changes(ctx)
 
     print(f"Changed name of fund from '{old_name}' to '{name}'.")
 
@@ -84,11 +75,7 @@ def rename_account(ctx, key, name):
     old_name = account.name
     account.name = name
 
-    if not ctx.obj["DRY_RUN"]:
-        path = ctx.obj["PATH"]
-        funds = ctx.obj["FUNDS"]
-        with open(path, "w") as file:
-            save_accounts_and_funds(file, accounts, funds)
+    save_changes(ctx)
 
     print(f"Changed name of account from '{old_name}' to '{name}'.")
 
@@ -110,11 +97,7 @@ def change_target(ctx, key, target):
 
     fund.target = target
 
-    if not ctx.obj["DRY_RUN"]:
-        path = ctx.obj["PATH"]
-        accounts = ctx.obj["ACCOUNTS"]
-        with open(path, "w") as file:
-            save_accounts_and_funds(file, accounts, funds)
+    save_changes(ctx)
 
     print(f"Changed target of fund '{fund.name}' to € {target:.2f}.")
 
@@ -135,11 +118,7 @@ def change_target_date(ctx, key, target_date):
 
     fund.target_date = target_date
 
-    if not ctx.obj["DRY_RUN"]:
-        path = ctx.obj["PATH"]
-        accounts = ctx.obj["ACCOUNTS"]
-        with open(path, "w") as file:
-            save_accounts_and_funds(file, accounts, funds)
+    save_changes(ctx)
 
     print(f"Changed target date of fund '{fund.name}' to {target_date}.")
 
@@ -158,11 +137,7 @@ def change_saving_days(ctx, key, days):
 
     fund.days = days
 
-    if not ctx.obj["DRY_RUN"]:
-        path = ctx.obj["PATH"]
-        accounts = ctx.obj["ACCOUNTS"]
-        with open(path, "w") as file:
-            save_accounts_and_funds(file, accounts, funds)
+    save_changes(ctx)
 
     print(f"Changed saving days of fund '{fund.name}' to {days}.")
 
@@ -186,11 +161,7 @@ def change_monthly_factor(ctx, key, factor):
 
     fund.monthly_factor = factor
 
-    if not ctx.obj["DRY_RUN"]:
-        path = ctx.obj["PATH"]
-        accounts = ctx.obj["ACCOUNTS"]
-        with open(path, "w") as file:
-            save_accounts_and_funds(file, accounts, funds)
+    save_changes(ctx)
 
     print(
         f"Monthly factor of fund group '{fund.name}' is set to {str(factor)}."
@@ -217,11 +188,7 @@ def change_account(ctx, key, account_key):
     fund.account = account
     account.funds[key] = fund
 
-    if not ctx.obj["DRY_RUN"]:
-        path = ctx.obj["PATH"]
-        accounts = ctx.obj["ACCOUNTS"]
-        with open(path, "w") as file:
-            save_accounts_and_funds(file, accounts, funds)
+    save_changes(ctx)
 
     print(f"Changed account of fund '{fund.name}' to '{account.name}'.")
 
@@ -243,14 +210,13 @@ def change_parent_group(ctx, key, parent_key):
     if key == "root":
         validate_fund_type(fund, FundGroup)
 
-    funds.remove_fund_by_key(key)
-    new_parent_fund.funds[fund.key] = fund
+    try:
+        funds.move_fund_to_group(key, parent_key)
+    except Exception as e:
+        print(e.args[0])
+        raise SystemExit(1)
 
-    if not ctx.obj["DRY_RUN"]:
-        path = ctx.obj["PATH"]
-        accounts = ctx.obj["ACCOUNTS"]
-        with open(path, "w") as file:
-            save_accounts_and_funds(file, accounts, funds)
+    save_changes(ctx)
 
     print(f"Changed parent of fund '{fund.name}' to '{new_parent_fund.name}'")
 
@@ -264,22 +230,14 @@ def change_iban(ctx, key, iban):
     accounts = ctx.obj["ACCOUNTS"]
     validate_existing_account_key(accounts, key)
 
-    try:
-        iban = IBAN(iban)
-    except SchwiftyException as e:
-        print(f"Problem with IBAN: {e.args[0]}")
-        raise SystemExit(1)
+    iban = validate_iban(iban)
 
     account = accounts[key]
     account.iban = iban
 
-    if not ctx.obj["DRY_RUN"]:
-        path = ctx.obj["PATH"]
-        funds = ctx.obj["FUNDS"]
-        with open(path, "w") as file:
-            save_accounts_and_funds(file, accounts, funds)
+    save_changes(ctx)
 
-    print(f"Changed IBAN of '{account.name}' to '{iban.formatted}'.")
+    print(f"Changed IBAN of '{account.name}' to '{iban}'.")
 
 
 @click.command()
@@ -294,10 +252,6 @@ def change_comments(ctx, key, comments):
     account = accounts[key]
     account.comments = comments
 
-    if not ctx.obj["DRY_RUN"]:
-        path = ctx.obj["PATH"]
-        funds = ctx.obj["FUNDS"]
-        with open(path, "w") as file:
-            save_accounts_and_funds(file, accounts, funds)
+    save_changes(ctx)
 
     print(f"Changed comment of '{account.name}' to:\n{comments}")
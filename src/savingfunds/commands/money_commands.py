@@ -1,11 +1,11 @@
 import click
 
 from savingfunds.commands.utils import (
+    save_changes,
     validate_amount,
     validate_existing_fund_key,
     validate_fund_type,
 )
-from savingfunds.datasaver import save_accounts_and_funds
 from savingfunds.funds import BalanceFund, TargetFund
 
 
@@ -32,11 +32,7 @@ def deposit(ctx, key, amount, increase_target):
     elif increase_target:
         fund.target += amount
 
-    if not ctx.obj["DRY_RUN"]:
-        path = ctx.obj["PATH"]
-        accounts = ctx.obj["ACCOUNTS"]
-        with open(path, "w") as file:
-            save_accounts_and_funds(file, accounts, funds)
+    save_changes(ctx)
 
     print(
         f"Deposited € {amount:.2f} to '{fund.name}'."
@@ -74,11 +70,7 @@ def withdraw(ctx, key, amount, lower_target):
     elif lower_target:
         fund.target -= amount
 
-    if not ctx.obj["DRY_RUN"]:
-        path = ctx.obj["PATH"]
-        accounts = ctx.obj["ACCOUNTS"]
-        with open(path, "w") as file:
-            save_accounts_and_funds(file, accounts, funds)
+    save_changes(ctx)
 
     print(
         f"Withdrawn € {amount:.2f} from '{fund.name}'."
@@ -3,12 +3,14 @@ from decimal import Decimal
 import click
 
 from savingfunds.commands.utils import (
+    save_changes,
     validate_amount,
     validate_existing_account_key,
+    validate_iban,
     validate_new_account_key,
     validate_new_fund_key,
 )
-from savingfunds.datasaver import save_accounts_and_funds, save_funds_data
+from savingfunds.datasaver import write_funds_data_file
 from savingfunds.funds import (
     Account,
     FixedEndFund,
@@ -33,29 +35,36 @@ def init(ctx, account_key, account_name, group_key, group_name):
     funds = [group.to_dict()]
 
     if not ctx.obj["DRY_RUN"]:
-        with open(ctx.obj["PATH"], "w") as file:
-            save_funds_data(file, accounts, funds)
+        # Nothing is loaded, so lock before replacing another file.
+        ctx.obj.lock()
+        write_funds_data_file(
+            ctx.obj["PATH"],
+            accounts,
+            funds,
+            ctx.obj["FORMAT"],
+            ctx.obj["BACKUPS"],
+        )
 
     print(f"Initialized new fund collection in '{ctx.obj['PATH']}'.")
 
 
 @click.command()
+@click.option("--iban", type=click.STRING, help="The IBAN of the account.")
 @click.argument("key", type=click.STRING)
 @click.argument("name", type=click.STRING)
 @click.pass_context
-def new_account(ctx, key, name):
+def new_account(ctx, iban, key, name):
     """Add a new account to the program."""
     accounts = ctx.obj["ACCOUNTS"]
 
     validate_new_account_key(accounts, key)
+    if iban is not None:
+        iban = validate_iban(iban)
 
-    new_account = Account(key, name)
+    new_account = Account(key, name, iban)
     accounts[key] = new_account
 
-    if not ctx.obj["DRY_RUN"]:
-        path = ctx.obj["PATH"]
-        with open(path, "w") as file:
-            save_accounts_and_funds(file, accounts, ctx.obj["FUNDS"])
+    save_changes(ctx)
 
     print(f"Added new account with key '{key}' and name '{name}'.")
 
@@ -77,11 +86,7 @@ def new_fund_group(ctx, parent_group_key, key, name):
         click.echo(f"No fund group with key '{parent_group_key}' found.")
         raise SystemExit(1)
 
-    if not ctx.obj["DRY_RUN"]:
-        path = ctx.obj["PATH"]
-        accounts = ctx.obj["ACCOUNTS"]
-        with open(path, "w") as file:
-            save_accounts_and_funds(file, accounts, funds)
+    save_changes(ctx)
 
     print(f"Added new fund group with key '{key}' and name '{name}'.")
 
@@ -98,7 +103,6 @@ def new_fixed_end_fund(
     ctx, parent_group_key, key, name, account_key, target, target_date
 ):
     """Add a new fixed end fund."""
-    path = ctx.obj["PATH"]
     accounts = ctx.obj["ACCOUNTS"]
     funds = ctx.obj["FUNDS"]
 
@@ -117,10 +121,9 @@ def new_fixed_end_fund(
     if not funds.add_fund_to_group(new_fund, parent_group_key):
         click.echo(f"No fund group with key '{parent_group_key}' found.")
         raise SystemExit(1)
+    accounts[account_key].funds[key] = new_fund
 
-    if not ctx.obj["DRY_RUN"]:
-        with open(path, "w") as file:
-            save_accounts_and_funds(file, accounts, funds)
+    save_changes(ctx)
 
     print(
         f"""
@@ -145,7 +148,6 @@ def new_open_end_fund(
     ctx, parent_group_key, key, name, account_key, target, days
 ):
     """Add a new open end fund."""
-    path = ctx.obj["PATH"]
     accounts = ctx.obj["ACCOUNTS"]
     funds = ctx.obj["FUNDS"]
 
@@ -166,20 +168,19 @@ def new_open_end_fund(
     if not funds.add_fund_to_group(new_fund, parent_group_key):
         click.echo(f"No fund group with key '{parent_group_key}' found.")
         raise SystemExit(1)
+    accounts[account_key].funds[key] = new_fund
 
-    if not ctx.obj["DRY_RUN"]:
-        with open(path, "w") as file:
-            save_accounts_and_funds(file, accounts, funds)
+    save_changes(ctx)
 
-        print(
-            f"""
+    print(
+        f"""
 Added new open-end fund with the following data:
 Key: {key}
 Name: {name}
 Target: € {target:.2f}
 Days: {days}
 """
-        )
+    )
 
 
 @click.command()
@@ -190,7 +191,6 @@ Days: {days}
 @click.pass_context
 def new_manual_fund(ctx, parent_group_key, key, name, account_key):
     """Add a new manual fund."""
-    path = ctx.obj["PATH"]
     accounts = ctx.obj["ACCOUNTS"]
     funds = ctx.obj["FUNDS"]
 
@@ -203,9 +203,8 @@ def new_manual_fund(ctx, parent_group_key, key, name, account_key):
     if not funds.add_fund_to_group(new_fund, parent_group_key):
         click.echo(f"No fund group with key '{parent_group_key}' found.")
         raise SystemExit(1)
+    accounts[account_key].funds[key] = new_fund
 
-    if not ctx.obj["DRY_RUN"]:
-        with open(path, "w") as file:
-            save_accounts_and_funds(file, accounts, funds)
+    save_changes(ctx)
 
     print(f"Added new manual fund with key '{key}' and name '{name}'.")
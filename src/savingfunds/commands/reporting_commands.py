@@ -2,20 +2,13 @@ from datetime import date
 from decimal import Decimal
 
 import click
-from rich import print
-from rich.markdown import Markdown
 
+from savingfunds import reportdata
 from savingfunds.commands.utils import (
     validate_existing_account_key,
     validate_existing_fund_key,
 )
-from savingfunds.reporting import (
-    print_account_details,
-    print_account_tree,
-    print_fund_details,
-    print_fund_tree,
-    print_funds_table,
-)
+from savingfunds.output import write_report, write_rows
 from savingfunds.utils import moneyfmt
 
 
@@ -24,6 +17,12 @@ from savingfunds.utils import moneyfmt
 def list_accounts(ctx):
     """Print a tree of all the accounts."""
     accounts = ctx.obj["ACCOUNTS"]
+    if ctx.obj["OUTPUT"] is not None:
+        write_rows(ctx.obj["OUTPUT"], reportdata.iter_account_rows(accounts))
+        return
+
+    from savingfunds.reporting import print_account_tree
+
     print_account_tree(accounts)
 
 
@@ -32,6 +31,12 @@ def list_accounts(ctx):
 def list_funds(ctx):
     """Print a tree of all the funds."""
     funds = ctx.obj["FUNDS"]
+    if ctx.obj["OUTPUT"] is not None:
+        write_rows(ctx.obj["OUTPUT"], reportdata.iter_fund_tree_rows(funds))
+        return
+
+    from savingfunds.reporting import print_fund_tree
+
     print_fund_tree(funds)
 
 
@@ -40,13 +45,19 @@ def list_funds(ctx):
 def funds_table(ctx):
     """Print a table with all funds."""
     funds = ctx.obj["FUNDS"]
+    if ctx.obj["OUTPUT"] is not None:
+        write_rows(ctx.obj["OUTPUT"], reportdata.iter_funds_table_rows(funds))
+        return
+
+    from savingfunds.reporting import print_funds_table
+
     print_funds_table(funds)
 
 
 @click.command()
 @click.option(
     "--when",
-    default=date.today().isoformat(),
+    default=lambda: date.today().isoformat(),
     type=click.DateTime(["%Y-%m-%d"]),
 )
 @click.pass_context
@@ -56,6 +67,14 @@ def total_daily_saving_rate(ctx, when):
     funds = ctx.obj["FUNDS"]
     tdsr = funds.daily_saving_rate(when)
 
+    if ctx.obj["OUTPUT"] is not None:
+        report = {
+            "when": when.isoformat(),
+            "daily_saving_rate": moneyfmt(tdsr, 4),
+        }
+        write_report(ctx.obj["OUTPUT"], report)
+        return
+
     print(f"Total daily saving rate: € {moneyfmt(tdsr, 4)}")
 
 
@@ -67,6 +86,15 @@ def monthly_amount(ctx, year, month):
     "Calculate the minimal monthly amount for the given month."
     funds = ctx.obj["FUNDS"]
 
+    if ctx.obj["OUTPUT"] is not None:
+        report = reportdata.monthly_amount(funds, year, month)
+        rows = reportdata.iter_monthly_amount_rows(report)
+        write_report(ctx.obj["OUTPUT"], report, rows)
+        return
+
+    from rich import print
+    from rich.markdown import Markdown
+
     minimal_monthly_amounts = {
         f: f.get_minimal_monthly_amount(year, month)
         for f in funds.funds.values()
@@ -104,6 +132,12 @@ def fund_details(ctx, key):
 
     fund = funds.get_fund_by_key(key)
 
+    if ctx.obj["OUTPUT"] is not None:
+        write_report(ctx.obj["OUTPUT"], reportdata.fund_details(fund))
+        return
+
+    from savingfunds.reporting import print_fund_details
+
     print_fund_details(fund)
 
 
@@ -117,4 +151,10 @@ def account_details(ctx, key):
 
     account = accounts[key]
 
+    if ctx.obj["OUTPUT"] is not None:
+        write_report(ctx.obj["OUTPUT"], reportdata.account_details(account))
+        return
+
+    from savingfunds.reporting import print_account_details
+
     print_account_details(account)
@@ -0,0 +1,128 @@
+import click
+
+
+@click.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False),
+    help="The socket to listen on. Defaults to the file with '.sock' "
+    + "appended.",
+)
+@click.option(
+    "--save-delay",
+    default=1.0,
+    type=click.FloatRange(min=0),
+    show_default=True,
+    help="Seconds without further changes after which changes are saved.",
+)
+@click.pass_context
+def serve(ctx, socket_path, save_delay):
+    """Serve commands on the funds over a Unix socket.
+
+    The file is loaded once and stays locked while serving. Run commands on
+    the server with the --server option. Stop the server with Ctrl+C or
+    SIGTERM; changes that were not saved yet are saved first.
+    """
+    import os
+    import signal
+
+    from savingfunds.server import (
+        FundsServer,
+        get_socket_path,
+        remove_stale_socket,
+    )
+
+    if socket_path is None:
+        socket_path = get_socket_path(ctx.obj["PATH"])
+
+    ctx.obj.load()
+    ctx.obj["BATCH"] = True
+    ctx.obj["UNSAVED"] = False
+
+    try:
+        remove_stale_socket(socket_path)
+    except FileExistsError as e:
+        click.echo(e.args[0])
+        raise SystemExit(1)
+
+    def stop(signum, frame):
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+
+    server = FundsServer(socket_path, ctx, save_delay)
+    saved = False
+    try:
+        click.echo(f"Serving '{ctx.obj['PATH']}' on '{socket_path}'.")
+        # Without a save delay, changes are saved after every request.
+        server.serve_forever(poll_interval=min(save_delay, 0.5) or 0.5)
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        server.server_close()
+        os.unlink(socket_path)
+        # Only reports a failure, so that an error of serving is not hidden.
+        saved = server.try_save()
+
+    if not saved:
+        click.echo("The last changes could not be saved.")
+        raise SystemExit(1)
+
+
+@click.command(
+    context_settings={
+        "ignore_unknown_options": True,
+        "allow_extra_args": True,
+        "help_option_names": [],
+    }
+)
+@click.pass_context
+def forward_to_server(ctx):
+    """Run the command with its arguments on the server."""
+    from savingfunds.server import send_command
+
+    try:
+        exit_code, output = send_command(
+            ctx.obj["SERVER"], [ctx.info_name] + ctx.args
+        )
+    except OSError as e:
+        click.echo(f"Could not connect to the server: {e.strerror}")
+        raise SystemExit(1)
+
+    click.echo(output, nl=False)
+    if exit_code != 0:
+        raise SystemExit(exit_code)
+
+
+@click.command()
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", default=8080, type=click.INT, show_default=True)
+@click.pass_context
+def serve_api(ctx, host, port):
+    """Serve an HTTP API with JSON responses on the funds.
+
+    The file is loaded once and stays locked while serving. Changes are
+    saved as soon as they are made. Stop the server with Ctrl+C or SIGTERM.
+    """
+    import asyncio
+    import signal
+
+    from savingfunds.api import FundsApi
+
+    ctx.obj.load()
+
+    def stop(signum, frame):
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+
+    def ready(address):
+        click.echo(
+            f"Serving '{ctx.obj['PATH']}' on http://{address[0]}:{address[1]}/."
+        )
+
+    try:
+        asyncio.run(FundsApi(ctx).serve(host, port, ready))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,99 @@
+from datetime import date
+
+import click
+
+from savingfunds.commands.utils import (
+    validate_amount,
+    validate_existing_account_key,
+)
+from savingfunds.dataloader import convert_data_to_accounts_and_funds
+from savingfunds.datasaver import (
+    accounts_dict_to_accounts_data,
+    funds_group_to_funds_data,
+)
+from savingfunds.funds import FixedEndFund
+from savingfunds.utils import moneyfmt
+
+
+def iter_months(year, month, months):
+    for _ in range(months):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+@click.command()
+@click.argument("year", type=click.INT)
+@click.argument("month", type=click.IntRange(min=1, max=12))
+@click.argument("months", type=click.IntRange(min=1))
+@click.argument("amount", type=click.STRING)
+@click.option(
+    "--interest",
+    type=(click.STRING, click.STRING),
+    multiple=True,
+    metavar="ACCOUNT AMOUNT",
+    help="Monthly interest to distribute over the funds of an account.",
+)
+@click.pass_context
+def simulate(ctx, year, month, months, amount, interest):
+    """Simulate monthly distributions over a number of months.
+
+    Starting in the given month, the amount is distributed every month as
+    with distribute-monthly. The file is never changed.
+    """
+    amount = validate_amount(amount)
+
+    # Simulate on a copy, since the objects may be used after the command,
+    # e.g. by a server. The copy is made from the data as it is saved, since
+    # the links between funds, groups and accounts are too deep to deepcopy.
+    accounts, funds = convert_data_to_accounts_and_funds(
+        {
+            "accounts": accounts_dict_to_accounts_data(ctx.obj["ACCOUNTS"]),
+            "funds": funds_group_to_funds_data(ctx.obj["FUNDS"]),
+        }
+    )
+    interest_amounts = []
+    for key, interest_amount in interest:
+        validate_existing_account_key(accounts, key)
+        interest_amounts.append(
+            (accounts[key], validate_amount(interest_amount))
+        )
+
+    unfilled = [
+        f
+        for f in funds.iter_funds()
+        if type(f) is FixedEndFund and f.remainder_to_save() > 0
+    ]
+
+    for y, m in iter_months(year, month, months):
+        when = date(y, m, 1)
+        _, remainder, deficit = funds.distribute_monthly_savings_tld(
+            y, m, amount
+        )
+        for account, interest_amount in interest_amounts:
+            account.distribute_interest(when, interest_amount)
+
+        line = (
+            f"{y}-{m:0>2}: balance € {moneyfmt(funds.balance)}"
+            + f", remaining to save € {moneyfmt(funds.remainder_to_save())}"
+        )
+        if remainder > 0:
+            line += f", remainder € {moneyfmt(remainder)}"
+        if deficit > 0:
+            line += f", deficit € {moneyfmt(deficit)}"
+        click.echo(line)
+
+        filled = [f for f in unfilled if f.remainder_to_save() == 0]
+        if len(filled) > 0:
+            unfilled = [f for f in unfilled if f.remainder_to_save() > 0]
+        for f in filled:
+            late = " (after its target date)" if when > f.target_date else ""
+            click.echo(f"  '{f.name}' reached its target{late}.")
+
+    if len(unfilled) > 0:
+        click.echo(
+            f"{len(unfilled)} fixed-end funds did not reach their target:"
+        )
+        for f in unfilled:
+            click.echo(
+                f"  '{f.name}': € {moneyfmt(f.remainder_to_save())} remaining."
+            )
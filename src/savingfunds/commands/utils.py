@@ -1,7 +1,16 @@
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
 
 import click
 
+from savingfunds.datasaver import write_funds_file
+from savingfunds.journal import (
+    accounts_and_funds_to_records,
+    append_to_journal,
+    diff_records,
+)
+from savingfunds.timings import timed
+from savingfunds.utils import CENT
+
 
 def validate_amount(amount):
     try:
@@ -12,6 +21,16 @@ def validate_amount(amount):
 
     amount = Decimal(amount)
 
+    if not amount.is_finite():
+        click.echo("The amount must be a finite number.")
+        raise SystemExit(1)
+
+    try:
+        amount.quantize(CENT)
+    except InvalidOperation:
+        click.echo("The amount is too large.")
+        raise SystemExit(1)
+
     if amount <= 0:
         click.echo("The amount must be positive.")
         raise SystemExit(1)
@@ -43,7 +62,55 @@ def validate_new_fund_key(funds, key):
         raise SystemExit(1)
 
 
+def validate_iban(iban):
+    """Validate the IBAN and return it in its formatted form."""
+    from schwifty import IBAN
+    from schwifty.exceptions import SchwiftyException
+
+    try:
+        return IBAN(iban).formatted
+    except SchwiftyException as e:
+        click.echo(f"Problem with IBAN: {e.args[0]}")
+        raise SystemExit(1)
+
+
 def validate_fund_type(fund, T):
     if not isinstance(fund, T):
         click.echo("The fund does not have the right type.")
         raise SystemExit(1)
+
+
+@timed("save")
+def save_changes(ctx):
+    if ctx.obj["DRY_RUN"]:
+        return
+    # Operations of a batch are saved at once by the batch command itself,
+    # and changes made on a server when it saves.
+    if ctx.obj["BATCH"]:
+        ctx.obj["UNSAVED"] = True
+        return
+
+    path = ctx.obj["PATH"]
+    accounts = ctx.obj["ACCOUNTS"]
+    funds = ctx.obj["FUNDS"]
+
+    if (
+        ctx.obj["JOURNAL"]
+        and path.exists()
+        and ctx.obj["JOURNAL_LENGTH"] + 1 < ctx.obj["COMPACT_AFTER"]
+    ):
+        records = accounts_and_funds_to_records(accounts, funds)
+        changes = diff_records(ctx.obj["RECORDS"], records)
+        if len(changes) > 0:
+            append_to_journal(path, ctx.info_name, ctx.params, changes)
+            # A server keeps running, so later changes need a new baseline.
+            ctx.obj["RECORDS"] = records
+            ctx.obj["JOURNAL_LENGTH"] += 1
+        return
+
+    write_funds_file(
+        path, accounts, funds, ctx.obj["FORMAT"], ctx.obj["BACKUPS"]
+    )
+    ctx.obj["JOURNAL_LENGTH"] = 0
+    if ctx.obj["JOURNAL"]:
+        ctx.obj["RECORDS"] = accounts_and_funds_to_records(accounts, funds)
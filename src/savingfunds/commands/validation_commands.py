@@ -0,0 +1,27 @@
+import click
+
+
+@click.command()
+@click.pass_context
+def validate(ctx):
+    """Validate the IBANs of all accounts."""
+    from schwifty import IBAN
+    from schwifty.exceptions import SchwiftyException
+
+    accounts = ctx.obj["ACCOUNTS"]
+
+    problems = 0
+    for account in accounts.values():
+        if account.iban is None:
+            continue
+
+        try:
+            IBAN(account.iban)
+        except SchwiftyException as e:
+            click.echo(f"Problem with IBAN of '{account.name}': {e.args[0]}")
+            problems += 1
+
+    if problems > 0:
+        raise SystemExit(1)
+
+    click.echo("All IBANs are valid.")
@@ -1,11 +1,6 @@
 from datetime import date
 from decimal import Decimal
 
-import yaml
-from schwifty import IBAN
-from schwifty.exceptions import SchwiftyException
-from yaml import BaseLoader
-
 from savingfunds.funds import (
     Account,
     FixedEndFund,
@@ -13,6 +8,7 @@ from savingfunds.funds import (
     ManualFund,
     OpenEndFund,
 )
+from savingfunds.timings import timed
 
 
 def build_fund_tree(fund_data, accounts, group):
@@ -30,7 +26,7 @@ def build_fund_tree(fund_data, accounts, group):
                     target_date,
                 )
                 acct.funds[fund.key] = fund
-                group.funds[fund.key] = fund
+                group.add_fund(fund)
             case "open":
                 acct = accounts[fnd["account"]]
                 fund = OpenEndFund(
@@ -42,36 +38,27 @@ def build_fund_tree(fund_data, accounts, group):
                     int(fnd["days"]),
                 )
                 acct.funds[fund.key] = fund
-                group.funds[fund.key] = fund
+                group.add_fund(fund)
             case "group":
                 fund_group = FundGroup(fnd["key"], fnd["name"])
                 build_fund_tree(fnd["funds"], accounts, fund_group)
-                group.funds[fund_group.key] = fund_group
+                group.add_fund(fund_group)
             case "manual":
                 acct = accounts[fnd["account"]]
                 fund = ManualFund(
                     fnd["key"], fnd["name"], acct, Decimal(fnd["balance"])
                 )
                 acct.funds[fund.key] = fund
-                group.funds[fund.key] = fund
+                group.add_fund(fund)
 
 
+@timed("convert")
 def convert_data_to_accounts_and_funds(data):
     acct_data = data["accounts"]
     accounts = {}
     for acct in acct_data:
-        if acct["iban"] != "":
-            try:
-                iban = IBAN(acct["iban"])
-            except SchwiftyException as e:
-                print(
-                    "There is a problem with the iban of '"
-                    + acct["name"]
-                    + "'."
-                )
-                print(e.args[0])
-            acct["iban"] = iban
-        else:
+        # IBANs are validated when they are changed, not on every load.
+        if acct["iban"] == "":
             acct["iban"] = None
         accounts[acct["key"]] = Account(**acct)
 
@@ -82,12 +69,151 @@ def convert_data_to_accounts_and_funds(data):
         if "monthly-factor" in fund_data:
             group.monthly_factor = Decimal(fund_data["monthly-factor"])
         build_fund_tree(fund_data["funds"], accounts, group)
-        root_fund_group.funds[key] = group
+        root_fund_group.add_fund(group)
 
     return accounts, root_fund_group
 
 
-def load_accounts_and_funds(file):
-    data = yaml.load(file, BaseLoader)
+def load_yaml_data(file):
+    import yaml
+
+    try:
+        from yaml import CBaseLoader as BaseLoader
+    except ImportError:
+        from yaml import BaseLoader
+
+    return yaml.load(file, BaseLoader)
+
+
+def load_json_data(file):
+    import json
+
+    return json.load(file)
+
+
+def load_funds_data(file, file_format="yaml"):
+    match file_format:
+        case "yaml":
+            return load_yaml_data(file)
+        case "json":
+            return load_json_data(file)
+
+    raise ValueError(f"Unknown file format '{file_format}'.")
+
+
+def fund_from_data(fnd, funds):
+    """Create a fund without account from its data.
+
+    `funds` are the already created funds of a group.
+    """
+    match fnd["type"]:
+        case "fixed":
+            return FixedEndFund(
+                fnd["key"],
+                fnd["name"],
+                None,
+                Decimal(fnd["balance"]),
+                Decimal(fnd["target"]),
+                date.fromisoformat(fnd["target_date"]),
+            )
+        case "open":
+            return OpenEndFund(
+                fnd["key"],
+                fnd["name"],
+                None,
+                Decimal(fnd["balance"]),
+                Decimal(fnd["target"]),
+                int(fnd["days"]),
+            )
+        case "group":
+            fund_group = FundGroup(fnd["key"], fnd["name"])
+            for f in funds:
+                fund_group.add_fund(f)
+            return fund_group
+        case "manual":
+            return ManualFund(
+                fnd["key"], fnd["name"], None, Decimal(fnd["balance"])
+            )
+
+
+def stream_yaml_accounts_and_funds(file):
+    """Create the accounts and funds while parsing a YAML funds file.
+
+    Every mapping is turned into an account or fund as soon as it has been
+    parsed, so the document is never held in memory as a whole.
+    """
+    import yaml
+
+    try:
+        from yaml import CBaseLoader as BaseLoader
+    except ImportError:
+        from yaml import BaseLoader
+
+    accounts = {}
+    root_fund_group = FundGroup("root", "Root")
+    account_keys = []
+
+    # Containers being parsed, with the key under which they will be stored
+    # in their parent mapping.
+    stack = []
+    key = None
+    for event in yaml.parse(file, BaseLoader):
+        if isinstance(event, yaml.ScalarEvent):
+            value = event.value
+        elif isinstance(event, yaml.MappingStartEvent):
+            stack.append((key, {}))
+            key = None
+            continue
+        elif isinstance(event, yaml.SequenceStartEvent):
+            stack.append((key, []))
+            key = None
+            continue
+        elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+            key, value = stack.pop()
+            if len(stack) == 0:
+                continue
+            parent_key = stack[-1][0]
+            if type(value) is dict and parent_key == "accounts":
+                if value["iban"] == "":
+                    value["iban"] = None
+                value = Account(**value)
+                accounts[value.key] = value
+            elif type(value) is dict and parent_key == "funds":
+                if len(stack) == 2:
+                    # Top level groups are added to the root group.
+                    group = fund_from_data(value, value["funds"])
+                    if "monthly-factor" in value:
+                        group.monthly_factor = Decimal(value["monthly-factor"])
+                    root_fund_group.add_fund(group)
+                    continue
+                fund = fund_from_data(value, value.get("funds"))
+                if "account" in value:
+                    account_keys.append((fund, value["account"]))
+                value = fund
+        else:
+            continue
+
+        container = stack[-1][1]
+        if type(container) is list:
+            container.append(value)
+        elif key is None:
+            key = value
+        else:
+            container[key] = value
+            key = None
+
+    # The accounts may follow the funds, so they are linked at the end.
+    for fund, account_key in account_keys:
+        fund.account = accounts[account_key]
+        fund.account.funds[fund.key] = fund
+
+    return accounts, root_fund_group
+
+
+def load_accounts_and_funds(file, file_format="yaml"):
+    if file_format == "yaml":
+        return stream_yaml_accounts_and_funds(file)
+
+    data = load_funds_data(file, file_format)
 
     return convert_data_to_accounts_and_funds(data)
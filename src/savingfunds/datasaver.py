@@ -1,4 +1,9 @@
-import yaml
+import io
+import os
+import shutil
+import tempfile
+
+from savingfunds.journal import get_journal_path
 
 
 def funds_group_to_funds_data(funds_group):
@@ -9,14 +14,147 @@ def accounts_dict_to_accounts_data(accounts):
     return [a.to_dict() for a in accounts.values()]
 
 
-def save_funds_data(file, accounts_data, funds_data):
+def save_yaml_data(file, data):
+    import yaml
+
+    try:
+        from yaml import CDumper as Dumper
+    except ImportError:
+        from yaml import Dumper
+
+    yaml.dump(data, file, Dumper)
+
+
+def save_json_data(file, data):
+    import json
+
+    json.dump(data, file, separators=(",", ":"))
+
+
+def save_funds_data(file, accounts_data, funds_data, file_format="yaml"):
     data = {"accounts": accounts_data, "funds": funds_data}
-    yaml.dump(data, file)
+    match file_format:
+        case "yaml":
+            save_yaml_data(file, data)
+        case "json":
+            save_json_data(file, data)
+        case _:
+            raise ValueError(f"Unknown file format '{file_format}'.")
 
 
-def save_accounts_and_funds(file, accounts, funds):
+def save_accounts_and_funds(file, accounts, funds, file_format="yaml"):
     save_funds_data(
         file,
         accounts_dict_to_accounts_data(accounts),
         funds_group_to_funds_data(funds),
+        file_format,
+    )
+
+
+def get_backup_path(path, n):
+    return path.with_name(f"{path.name}.{n}")
+
+
+def rotate_backups(path, backups):
+    for n in range(backups - 1, 0, -1):
+        if get_backup_path(path, n).exists():
+            os.replace(get_backup_path(path, n), get_backup_path(path, n + 1))
+
+    # Hard link the current file, so it stays in place until it is replaced.
+    backup_path = get_backup_path(path, 1)
+    backup_path.unlink(missing_ok=True)
+    try:
+        os.link(path, backup_path)
+    except OSError:
+        shutil.copy2(path, backup_path)
+
+
+def file_has_contents(path, contents):
+    try:
+        if os.path.getsize(path) != len(contents.encode()):
+            return False
+        with open(path, "r", newline="") as file:
+            return file.read() == contents
+    except OSError:
+        return False
+
+
+def write_atomically(path, contents, backups=0):
+    """Replace the file at `path` with `contents` without truncating it.
+
+    The contents are written to a temporary file in the same directory, which
+    is synced to disk and then renamed over `path`, so readers never see a
+    partially written file. A symbolic link at `path` is written through.
+    Returns False when the file already had the given contents and was left
+    untouched.
+    """
+    path = path.resolve()
+    if file_has_contents(path, contents):
+        return False
+
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f".{path.name}.", suffix=".tmp", dir=path.parent
+    )
+    try:
+        with os.fdopen(fd, "w", newline="") as file:
+            file.write(contents)
+            file.flush()
+            os.fsync(file.fileno())
+
+        if path.exists():
+            os.chmod(tmp_path, os.stat(path).st_mode)
+            if backups > 0:
+                rotate_backups(path, backups)
+        else:
+            # mkstemp creates the file for the owner only, while a new file
+            # should get the permissions it would get from open().
+            os.chmod(tmp_path, 0o666 & ~get_umask())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    # The rename only survives a power loss once the directory is synced.
+    sync_directory(path.parent)
+
+    return True
+
+
+def get_umask():
+    # The umask can only be read by setting it.
+    umask = os.umask(0)
+    os.umask(umask)
+
+    return umask
+
+
+def sync_directory(path):
+    if os.name != "posix":
+        return
+
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_funds_data_file(
+    path, accounts_data, funds_data, file_format, backups=0
+):
+    """Write a complete snapshot to `path`, superseding any journal."""
+    contents = io.StringIO()
+    save_funds_data(contents, accounts_data, funds_data, file_format)
+    write_atomically(path, contents.getvalue(), backups)
+
+    get_journal_path(path).unlink(missing_ok=True)
+
+
+def write_funds_file(path, accounts, funds, file_format, backups=0):
+    write_funds_data_file(
+        path,
+        accounts_dict_to_accounts_data(accounts),
+        funds_group_to_funds_data(funds),
+        file_format,
+        backups,
     )
@@ -1,13 +1,12 @@
 import calendar
+from collections import deque
 from datetime import date
-from decimal import Decimal
-
-from rich.columns import Columns
-from rich.console import Group
-from rich.progress_bar import ProgressBar
-from rich.tree import Tree
+from decimal import ROUND_DOWN, Decimal
 
 from savingfunds.utils import (
+    CENT,
+    INFINITY,
+    ZERO,
     dec_round,
     moneyfmt,
     fix_overdistribution,
@@ -16,6 +15,8 @@ from savingfunds.utils import (
 
 
 class Account:
+    __slots__ = ("name", "key", "iban", "comments", "funds")
+
     def __init__(self, key, name, iban=None, comments=""):
         self.name = name
         self.key = key
@@ -32,7 +33,7 @@ class Account:
     def get_iban_as_str(self):
         if self.iban is None:
             return "-"
-        return self.iban.formatted
+        return self.iban
 
     def distribute_interest(self, date, amount):
         manual_funds = {
@@ -70,15 +71,22 @@ class Account:
         if total_dsr == Decimal(0):
             manual_funds_amount = amount
         else:
-            amounts = {
-                k: dec_round(non_manual_funds_amount * v / total_dsr, 2)
+            shares = {
+                k: non_manual_funds_amount * v / total_dsr
                 for k, v in child_dsr.items()
             }
+            amounts = {k: dec_round(v, 2) for k, v in shares.items()}
             amounts = fix_overdistribution(
-                amounts, non_manual_funds_amount, list(non_manual_funds.keys())
+                amounts,
+                non_manual_funds_amount,
+                list(non_manual_funds.keys()),
+                shares,
             )
             amounts = fix_underdistribution(
-                amounts, non_manual_funds_amount, list(non_manual_funds.keys())
+                amounts,
+                non_manual_funds_amount,
+                list(non_manual_funds.keys()),
+                shares,
             )
 
         amounts = {
@@ -120,13 +128,46 @@ class Account:
         return {
             "key": self.key,
             "name": self.name,
-            "iban": "" if self.iban is None else self.iban.formatted,
+            "iban": "" if self.iban is None else self.iban,
             "comments": self.comments,
         }
 
 
-class FixedEndFund:
+class BaseFund:
+    """Base of the funds that hold a balance themselves.
+
+    Changing the balance or target of a fund invalidates the cached totals and
+    saving rates of the fund groups containing it.
+    """
+
+    __slots__ = ("parent", "key", "name", "account", "_balance")
+
+    @property
+    def balance(self):
+        return self._balance
+
+    @balance.setter
+    def balance(self, balance):
+        self._balance = balance
+        if self.parent is not None:
+            self.parent.invalidate()
+
+    @property
+    def target(self):
+        return self._target
+
+    @target.setter
+    def target(self, target):
+        self._target = target
+        if self.parent is not None:
+            self.parent.invalidate()
+
+
+class FixedEndFund(BaseFund):
+    __slots__ = ("_target", "_target_date")
+
     def __init__(self, key, name, account, balance, target, target_date):
+        self.parent = None
         self.key = key
         self.name = name
         self.balance = balance
@@ -134,8 +175,19 @@ class FixedEndFund:
         self.target = target
         self.target_date = target_date
 
+    @property
+    def target_date(self):
+        return self._target_date
+
+    @target_date.setter
+    def target_date(self, target_date):
+        self._target_date = target_date
+        if self.parent is not None:
+            self.parent.invalidate()
+
     def remainder_to_save(self):
-        return max(Decimal(0), self.target - self.balance)
+        remainder = self._target - self._balance
+        return remainder if remainder > 0 else ZERO
 
     def daily_saving_rate(self, date):
         days = (self.target_date - date).days
@@ -149,6 +201,10 @@ class FixedEndFund:
         return min(dsr * days, self.remainder_to_save())
 
     def get_as_tree(self, tree):
+        from rich.columns import Columns
+        from rich.console import Group
+        from rich.progress_bar import ProgressBar
+
         progress = self.balance / self.target * Decimal(100)
         progress_bar = ProgressBar(completed=float(progress), width=40)
         columns = Columns(
@@ -177,8 +233,11 @@ class FixedEndFund:
         }
 
 
-class OpenEndFund:
+class OpenEndFund(BaseFund):
+    __slots__ = ("_target", "_days")
+
     def __init__(self, key, name, account, balance, target, days):
+        self.parent = None
         self.key = key
         self.name = name
         self.account = account
@@ -186,8 +245,19 @@ class OpenEndFund:
         self.target = target
         self.days = days
 
+    @property
+    def days(self):
+        return self._days
+
+    @days.setter
+    def days(self, days):
+        self._days = days
+        if self.parent is not None:
+            self.parent.invalidate()
+
     def remainder_to_save(self):
-        return max(Decimal(0), self.target - self.balance)
+        remainder = self._target - self._balance
+        return remainder if remainder > 0 else ZERO
 
     def daily_saving_rate(self, date):
         return self.target / self.days
@@ -197,6 +267,10 @@ class OpenEndFund:
         return min(dsr * days, self.remainder_to_save())
 
     def get_as_tree(self, tree):
+        from rich.columns import Columns
+        from rich.console import Group
+        from rich.progress_bar import ProgressBar
+
         progress = self.balance / self.target * Decimal(100)
         progress_bar = ProgressBar(completed=float(progress), width=40)
         columns = Columns(
@@ -225,8 +299,11 @@ class OpenEndFund:
         }
 
 
-class ManualFund:
+class ManualFund(BaseFund):
+    __slots__ = ()
+
     def __init__(self, key, name, account, balance):
+        self.parent = None
         self.key = key
         self.name = name
         self.account = account
@@ -237,13 +314,13 @@ class ManualFund:
         return self.balance
 
     def remainder_to_save(self):
-        return Decimal(0)
+        return ZERO
 
     def daily_saving_rate(self, date):
-        return Decimal(0)
+        return ZERO
 
     def ndays_saving(self, date, days):
-        return Decimal(0)
+        return ZERO
 
     def get_as_tree(self, tree):
         return tree.add(f"[cyan]{self.name}[/cyan]: € {self.balance:.2f}")
@@ -262,82 +339,234 @@ class ManualFund:
 
 
 class FundGroup:
+    __slots__ = (
+        "name",
+        "key",
+        "funds",
+        "monthly_factor",
+        "parent",
+        "_index",
+        "_totals",
+        "_rates",
+    )
+
     def __init__(self, key, name, monthly_factor=Decimal(1)):
         self.name = name
         self.key = key
         self.funds = {}
         self.monthly_factor = monthly_factor
+        self.parent = None
+        # Lazily built map of key -> (fund, parent) for the whole subtree.
+        self._index = None
+        # Cached (balance, target, contains manual fund) of the subtree.
+        self._totals = None
+        # Cached saving rates of the subtree by (date, days), where days is
+        # None for the daily saving rate.
+        self._rates = {}
+
+    def _get_totals(self):
+        if self._totals is None:
+            balance = ZERO
+            target = ZERO
+            contains_manual = False
+            for f in self.funds.values():
+                balance += f.balance
+                target += f.target
+                if type(f) is ManualFund:
+                    contains_manual = True
+                elif type(f) is FundGroup and f.contains_manual_fund():
+                    contains_manual = True
+            self._totals = (balance, target, contains_manual)
+
+        return self._totals
+
+    def invalidate(self):
+        # A cached group implies cached subgroups, so we can stop at the
+        # first group without cached totals and saving rates.
+        group = self
+        while group is not None and (
+            group._totals is not None or len(group._rates) > 0
+        ):
+            group._totals = None
+            group._rates = {}
+            group = group.parent
 
     @property
     def balance(self):
-        return sum([f.balance for f in self.funds.values()])
+        return self._get_totals()[0]
 
     @property
     def target(self):
-        return sum([f.target for f in self.funds.values()])
+        return self._get_totals()[1]
 
     def remainder_to_save(self):
-        return max(Decimal(0), self.target - self.balance)
+        balance, target, _ = self._get_totals()
+        return target - balance if target > balance else ZERO
+
+    def add_fund(self, fund):
+        self.funds[fund.key] = fund
+        fund.parent = self
+        self.invalidate()
+
+    def remove_fund(self, key):
+        fund = self.funds.pop(key)
+        fund.parent = None
+        self.invalidate()
+
+        return fund
 
     def daily_saving_rate(self, date):
-        return sum([f.daily_saving_rate(date) for f in self.funds.values()])
+        key = (date, None)
+        if key not in self._rates:
+            self._rates[key] = sum(
+                [f.daily_saving_rate(date) for f in self.funds.values()]
+            )
+
+        return self._rates[key]
 
     def ndays_saving(self, date, days):
-        return sum([f.ndays_saving(date, days) for f in self.funds.values()])
+        key = (date, days)
+        if key not in self._rates:
+            self._rates[key] = sum(
+                [f.ndays_saving(date, days) for f in self.funds.values()]
+            )
+
+        return self._rates[key]
 
     def get_type(self):
         return "Group"
 
-    def contains_key(self, key):
-        if self.key == key or key in self.funds:
-            return True
-
-        for f in filter(lambda f: type(f) is FundGroup, self.funds.values()):
-            if f.contains_key(key):
-                return True
+    def _get_index(self):
+        if self._index is None:
+            self._index = {}
+            self._index_subtree(self)
+
+        return self._index
+
+    def _index_subtree(self, group):
+        for f, parent in group.iter_funds(with_parent=True):
+            self._index[f.key] = (f, parent)
+
+    def iter_funds(
+        self, depth_first=True, with_parent=False, with_depth=False
+    ):
+        """Iterate over all funds in this group and its subgroups.
+
+        Funds are visited depth first in pre-order (a group before the funds
+        it contains) or breadth first. With `with_parent` and `with_depth`
+        tuples are yielded containing the fund, its parent group and/or its
+        depth, where the direct children of this group have depth 1.
+        """
+        if not depth_first:
+            queue = deque([(self, 1)])
+            while len(queue) > 0:
+                group, depth = queue.popleft()
+                for f in group.funds.values():
+                    yield self._iter_item(
+                        f, group, depth, with_parent, with_depth
+                    )
+                    if type(f) is FundGroup:
+                        queue.append((f, depth + 1))
+            return
+
+        stack = [(self, iter(self.funds.values()), 1)]
+        while len(stack) > 0:
+            group, children, depth = stack[-1]
+            f = next(children, None)
+            if f is None:
+                stack.pop()
+                continue
+
+            yield self._iter_item(f, group, depth, with_parent, with_depth)
+            if type(f) is FundGroup:
+                stack.append((f, iter(f.funds.values()), depth + 1))
+
+    @staticmethod
+    def _iter_item(fund, parent, depth, with_parent, with_depth):
+        if not (with_parent or with_depth):
+            return fund
+
+        item = (fund,)
+        if with_parent:
+            item += (parent,)
+        if with_depth:
+            item += (depth,)
+
+        return item
 
-        return False
+    def contains_key(self, key):
+        return self.key == key or key in self._get_index()
 
     def add_fund_to_group(self, fund, group_key):
-        if self.key == group_key:
-            self.funds[fund.key] = fund
-            return True
+        group = self.get_fund_by_key(group_key)
+        if type(group) is not FundGroup:
+            return False
 
-        for f in filter(lambda f: type(f) is FundGroup, self.funds.values()):
-            if f.add_fund_to_group(fund, group_key):
-                return True
+        group.add_fund(fund)
+        self._get_index()[fund.key] = (fund, group)
+        if type(fund) is FundGroup:
+            self._index_subtree(fund)
 
-        return False
+        return True
 
     def get_fund_by_key(self, key):
         if self.key == key:
             return self
 
-        if key in self.funds:
-            return self.funds[key]
+        entry = self._get_index().get(key)
+        if entry is not None:
+            return entry[0]
 
-        for f in filter(lambda f: type(f) is FundGroup, self.funds.values()):
-            tmp = f.get_fund_by_key(key)
-            if tmp is not None:
-                return tmp
+    def get_parent_by_key(self, key):
+        entry = self._get_index().get(key)
+        if entry is not None:
+            return entry[1]
 
     def remove_fund_by_key(self, key):
-        if key in self.funds:
-            fund = self.funds[key]
-            if type(fund) is FundGroup:
-                if len(fund.funds) > 0:
-                    raise Exception(
-                        f"Fund with key '{key}' is a non-empty fund group."
-                    )
+        index = self._get_index()
+        if key not in index:
+            return False
+
+        fund, parent = index[key]
+        if type(fund) is FundGroup:
+            if len(fund.funds) > 0:
+                raise Exception(
+                    f"Fund with key '{key}' is a non-empty fund group."
+                )
 
-            del self.funds[key]
-            return True
+        parent.remove_fund(key)
+        del index[key]
+        return True
+
+    def move_fund_to_group(self, key, group_key):
+        index = self._get_index()
+        fund, parent = index[key]
+        group = self.get_fund_by_key(group_key)
+
+        # Walk up from the new parent to make sure we do not create a cycle.
+        ancestor = group
+        while ancestor is not self:
+            if ancestor is fund:
+                raise Exception(
+                    f"Fund group with key '{group_key}' is contained in "
+                    + f"the fund with key '{key}'."
+                )
+            ancestor = index[ancestor.key][1]
 
-        for f in filter(lambda f: type(f) is FundGroup, self.funds.values()):
-            if f.remove_fund_by_key(key):
-                return True
+        parent.remove_fund(key)
+        group.add_fund(fund)
+        index[key] = (fund, group)
 
-        return False
+    def zero_amounts(self):
+        """Return amounts of zero with the structure of distributed amounts."""
+        return {
+            k: (
+                (Decimal(0), f.zero_amounts())
+                if type(f) is FundGroup
+                else Decimal(0)
+            )
+            for k, f in self.funds.items()
+        }
 
     def distribute_extra_savings(self, when, amount, subgroup=False):
         child_dsr = {
@@ -348,41 +577,55 @@ class FundGroup:
 
         # We only have to distribute if there are saving rates.
         if total_child_dsr > 0:
-            # Iterate over the funds to determine which will be completely
-            # filled. These funds will get the amount necessary to fill them
-            # completely.
-            funds_left = list(self.funds.keys())
-            while True:
-                remainder_total_dsr = sum([child_dsr[k] for k in funds_left])
-                capping_funds = [
-                    k
-                    for k in funds_left
-                    if amount * child_dsr[k] / remainder_total_dsr
-                    >= self.funds[k].remainder_to_save()
-                ]
-
-                for k in capping_funds:
-                    amounts[k] = self.funds[k].remainder_to_save()
-                    amount -= amounts[k]
-                    funds_left.remove(k)
-
-                if len(capping_funds) == 0:
+            # Determine which funds will be completely filled. These funds
+            # will get the amount necessary to fill them completely. Filling
+            # a fund only raises the share of the others, so the funds are
+            # filled in order of their remainder relative to their daily
+            # saving rate until the next fund does not fill up.
+            remainders = {
+                k: f.remainder_to_save() for k, f in self.funds.items()
+            }
+
+            def fill_ratio(k):
+                if child_dsr[k] > 0:
+                    return remainders[k] / child_dsr[k]
+                return ZERO if remainders[k] == 0 else INFINITY
+
+            remainder_total_dsr = total_child_dsr
+            capped = set()
+            for k in sorted(self.funds, key=fill_ratio):
+                if remainders[k] > 0 and (
+                    remainder_total_dsr <= 0
+                    or amount * child_dsr[k] / remainder_total_dsr
+                    < remainders[k]
+                ):
                     break
 
+                amounts[k] = remainders[k]
+                amount -= amounts[k]
+                remainder_total_dsr -= child_dsr[k]
+                capped.add(k)
+
+            funds_left = [k for k in self.funds if k not in capped]
+
             # The rest of the funds will be filled based on the relative
             # propertions of their daily saving rates.
             remainder_total_dsr = sum([child_dsr[k] for k in funds_left])
+            shares = {
+                k: amount * child_dsr[k] / remainder_total_dsr
+                for k in funds_left
+            }
             for k in funds_left:
-                amounts[k] = dec_round(
-                    amount * child_dsr[k] / remainder_total_dsr, 2
-                )
+                amounts[k] = dec_round(shares[k], 2)
 
             # Check if rounding caused overdistribution.
-            amounts = fix_overdistribution(amounts, amount, funds_left)
+            amounts = fix_overdistribution(amounts, amount, funds_left, shares)
 
             # Make sure that all amounts are distributed in a subgroup.
             if subgroup:
-                amounts = fix_underdistribution(amounts, amount, funds_left)
+                amounts = fix_underdistribution(
+                    amounts, amount, funds_left, shares
+                )
 
             # Deduct the distributed amounts based on proportions.
             amount -= sum([amounts[k] for k in funds_left])
@@ -412,7 +655,7 @@ class FundGroup:
             # the way, amount is the remainder.
             return amounts, amount
 
-        return {k: Decimal(0) for k in self.funds}, amount
+        return self.zero_amounts(), amount
 
     def distribute_monthly_savings_tld(self, year, month, amount):
         _, days_in_month = calendar.monthrange(year, month)
@@ -463,7 +706,10 @@ class FundGroup:
             }
             for k, f in self.funds.items():
                 if upfactor_room_d[k] > 0:
-                    dist_amount = min(upfactor_room_d[k], remainder)
+                    # Only distribute whole cents to keep balances in cents.
+                    dist_amount = min(upfactor_room_d[k], remainder).quantize(
+                        CENT, ROUND_DOWN
+                    )
                     extra_amounts, new_remainder = f.distribute_extra_savings(
                         when, dist_amount
                     )
@@ -487,25 +733,27 @@ class FundGroup:
         minimal_amount = self.get_minimal_monthly_amount(year, month)
         deficit = max(Decimal(0), minimal_amount - amount)
         if minimal_amount == Decimal(0):
-            return {k: Decimal(0) for k in self.funds}, amount, Decimal(0)
+            return self.zero_amounts(), amount, Decimal(0)
 
         correction_ratio = min(Decimal(1), amount / minimal_amount)
 
-        amounts = {
+        shares = {
             k: min(
-                dec_round(
-                    f.ndays_saving(when, days_in_month) * correction_ratio, 2
-                ),
+                f.ndays_saving(when, days_in_month) * correction_ratio,
                 f.remainder_to_save(),
             )
             for k, f in self.funds.items()
         }
+        amounts = {
+            k: min(dec_round(v, 2), self.funds[k].remainder_to_save())
+            for k, v in shares.items()
+        }
         amounts = fix_overdistribution(
-            amounts, amount, list(self.funds.keys())
+            amounts, amount, list(self.funds.keys()), shares
         )
         if amount / minimal_amount <= Decimal(1):
             amounts = fix_underdistribution(
-                amounts, amount, list(self.funds.keys())
+                amounts, amount, list(self.funds.keys()), shares
             )
         remainder = amount - sum(amounts.values())
 
@@ -530,19 +778,14 @@ class FundGroup:
         )
 
     def contains_manual_fund(self):
-        manual_in_subgroup = any(
-            [
-                f.contains_manual_fund()
-                for f in self.funds.values()
-                if isinstance(f, FundGroup)
-            ]
-        )
-        return (
-            any([isinstance(f, ManualFund) for f in self.funds.values()])
-            or manual_in_subgroup
-        )
+        return self._get_totals()[2]
 
     def get_as_tree(self, tree):
+        from rich.columns import Columns
+        from rich.console import Group
+        from rich.progress_bar import ProgressBar
+        from rich.tree import Tree
+
         group = None
         label = f"{self.name}: € {self.balance:.2f}"
         if self.contains_manual_fund():
@@ -0,0 +1,219 @@
+"""Append-only journal of changes made to a funds file.
+
+Instead of rewriting the whole funds file after every command, the changed
+fund and account records are appended to a journal next to the file. The
+journal is replayed on top of the file when loading and is compacted into a
+new snapshot once it grows too long.
+
+An append interrupted by a crash or a full disk can leave an incomplete last
+line. Such a line is ignored when reading and cut off before the next entry
+is appended, so only the change of the interrupted command is lost.
+"""
+
+import json
+import os
+from datetime import datetime
+
+import click
+
+from savingfunds.funds import FundGroup
+
+
+def get_journal_path(path):
+    return path.with_name(path.name + ".journal")
+
+
+def group_to_record(group):
+    return {
+        "type": "group",
+        "key": group.key,
+        "name": group.name,
+        "monthly-factor": str(group.monthly_factor),
+    }
+
+
+def accounts_and_funds_to_records(accounts, funds):
+    """Return flat dicts of account and fund records, keyed by their keys.
+
+    The fund records are ordered such that every fund group precedes the
+    funds contained in it.
+    """
+    account_records = {k: a.to_dict() for k, a in accounts.items()}
+    fund_records = {}
+    for f, parent in funds.iter_funds(with_parent=True):
+        if type(f) is FundGroup:
+            record = group_to_record(f)
+        else:
+            record = f.to_dict()
+        record["parent"] = parent.key
+        fund_records[f.key] = record
+
+    return account_records, fund_records
+
+
+def diff_records(old, new):
+    old_accounts, old_funds = old
+    new_accounts, new_funds = new
+
+    changes = []
+    for k, record in new_accounts.items():
+        if old_accounts.get(k) != record:
+            changes.append({"account": record})
+    for k, record in new_funds.items():
+        if old_funds.get(k) != record:
+            changes.append({"fund": record})
+
+    # Remove contained funds before the groups containing them.
+    for k in reversed(old_funds):
+        if k not in new_funds:
+            changes.append({"remove-fund": k})
+    for k in old_accounts:
+        if k not in new_accounts:
+            changes.append({"remove-account": k})
+
+    return changes
+
+
+def append_to_journal(path, command, params, changes):
+    entry = {
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "command": command,
+        "params": params,
+        "changes": changes,
+    }
+    line = json.dumps(entry, default=str, separators=(",", ":")) + "\n"
+    with open(get_journal_path(path), "a+b") as file:
+        end_last_line(file)
+        file.write(line.encode())
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def end_last_line(file):
+    """End the last line of the journal before appending to it.
+
+    A last line without newline was left by an interrupted append. It is
+    completed when it holds a whole entry and cut off otherwise.
+    """
+    end = file.seek(0, os.SEEK_END)
+    if end == 0:
+        return
+    file.seek(end - 1)
+    if file.read(1) == b"\n":
+        return
+
+    # Search backwards for the end of the previous line.
+    start = end
+    tail = b""
+    while start > 0 and b"\n" not in tail:
+        start = max(0, start - 4096)
+        file.seek(start)
+        tail = file.read(end - start)
+    start += tail.rfind(b"\n") + 1
+
+    file.seek(start)
+    try:
+        json.loads(file.read(end - start))
+    except ValueError:
+        file.truncate(start)
+    else:
+        file.write(b"\n")
+
+
+def read_journal(path):
+    """Read the entries of the journal of the funds file at `path`.
+
+    An incomplete last line is ignored with a warning. Raises `ValueError`
+    when an earlier line is corrupt, since its changes cannot be skipped.
+    """
+    journal_path = get_journal_path(path)
+    if not journal_path.exists():
+        return []
+
+    with open(journal_path, "r") as file:
+        lines = [
+            (i, line) for i, line in enumerate(file, 1) if line.strip() != ""
+        ]
+
+    entries = []
+    for i, line in lines:
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            if i != lines[-1][0]:
+                raise ValueError(
+                    f"Line {i} of journal '{journal_path}' is corrupt."
+                )
+            click.echo(
+                "Ignoring the incomplete last line of journal"
+                + f" '{journal_path}'.",
+                err=True,
+            )
+
+    return entries
+
+
+def remove_identical(items, item):
+    # Compare on identity, since comparing the nested fund data is expensive.
+    for i, x in enumerate(items):
+        if x is item:
+            del items[i]
+            return
+
+
+def apply_journal(data, entries):
+    """Apply the changes of the journal entries to the loaded funds data.
+
+    The records describe the resulting state, so applying a journal to a
+    snapshot that already contains its changes leaves the snapshot intact.
+    """
+    accounts = {a["key"]: a for a in data["accounts"]}
+    funds = {}
+    groups = {"root": data["funds"]}
+
+    def index(fund_list):
+        for fnd in fund_list:
+            funds[fnd["key"]] = (fnd, fund_list)
+            if fnd["type"] == "group":
+                groups[fnd["key"]] = fnd["funds"]
+                index(fnd["funds"])
+
+    index(data["funds"])
+
+    for entry in entries:
+        for change in entry["changes"]:
+            if "account" in change:
+                record = change["account"]
+                if record["key"] in accounts:
+                    accounts[record["key"]].update(record)
+                else:
+                    accounts[record["key"]] = dict(record)
+                    data["accounts"].append(accounts[record["key"]])
+            elif "remove-account" in change:
+                acct = accounts.pop(change["remove-account"], None)
+                if acct is not None:
+                    remove_identical(data["accounts"], acct)
+            elif "fund" in change:
+                record = dict(change["fund"])
+                parent = groups[record.pop("parent")]
+                if record["key"] in funds:
+                    fnd, fund_list = funds[record["key"]]
+                    if fund_list is not parent:
+                        remove_identical(fund_list, fnd)
+                        parent.append(fnd)
+                    fnd.update(record)
+                else:
+                    fnd = record
+                    if fnd["type"] == "group":
+                        fnd["funds"] = []
+                        groups[fnd["key"]] = fnd["funds"]
+                    parent.append(fnd)
+                funds[fnd["key"]] = (fnd, parent)
+            elif "remove-fund" in change:
+                if change["remove-fund"] not in funds:
+                    continue
+                fnd, fund_list = funds.pop(change["remove-fund"])
+                remove_identical(fund_list, fnd)
+                groups.pop(fnd["key"], None)
+
+    return data
@@ -0,0 +1,40 @@
+"""Advisory locking of funds files.
+
+The lock is taken on a separate lock file next to the funds file, since the
+funds file itself is replaced on every save. Locking is only available on
+platforms providing `fcntl`; elsewhere the lock is a no-op.
+"""
+
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+def get_lock_path(path):
+    return path.with_name(path.name + ".lock")
+
+
+def lock_funds_file(path, exclusive, timeout):
+    """Lock the funds file at `path` and return the opened lock file.
+
+    Closing the returned file releases the lock. Raises `TimeoutError` when
+    the lock could not be acquired within `timeout` seconds.
+    """
+    file = open(get_lock_path(path), "a")
+    if fcntl is None:
+        return file
+
+    operation = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fcntl.flock(file.fileno(), operation | fcntl.LOCK_NB)
+            return file
+        except BlockingIOError:
+            if time.monotonic() >= deadline:
+                file.close()
+                raise TimeoutError(f"Could not lock '{path}' in time.")
+            time.sleep(0.05)
@@ -0,0 +1,63 @@
+"""Writing reports in the machine-readable formats of the `--output` option.
+
+Rows are written one at a time as they are produced, so large reports are
+never held in memory as a whole. A JSON report of rows is an array, NDJSON
+has an object per line and CSV a header followed by a line per row. Lists
+in a row, like the funds of an account, are joined by spaces in CSV.
+"""
+
+import csv
+import json
+import sys
+
+from savingfunds.timings import timed
+
+
+@timed("render")
+def write_rows(output_format, rows, file=None):
+    if file is None:
+        file = sys.stdout
+
+    _write_rows(output_format, rows, file)
+
+
+def _write_rows(output_format, rows, file):
+    match output_format:
+        case "json":
+            file.write("[")
+            separator = "\n"
+            for row in rows:
+                file.write(separator + json.dumps(row))
+                separator = ",\n"
+            file.write("\n]\n")
+        case "ndjson":
+            for row in rows:
+                file.write(json.dumps(row) + "\n")
+        case "csv":
+            writer = None
+            for row in rows:
+                if writer is None:
+                    writer = csv.DictWriter(file, fieldnames=list(row))
+                    writer.writeheader()
+                writer.writerow(
+                    {
+                        k: " ".join(v) if type(v) is list else v
+                        for k, v in row.items()
+                    }
+                )
+
+
+@timed("render")
+def write_report(output_format, report, rows=None, file=None):
+    """Write a report which is a single object.
+
+    In JSON the object itself is written, otherwise its `rows`, which
+    default to the object as the only row.
+    """
+    if file is None:
+        file = sys.stdout
+
+    if output_format == "json":
+        file.write(json.dumps(report) + "\n")
+    else:
+        _write_rows(output_format, [report] if rows is None else rows, file)
@@ -0,0 +1,200 @@
+"""The reports of the commands as plain data.
+
+Every report is built straight from the funds and accounts as dicts of
+strings, numbers and lists, which can be written as JSON or CSV without
+rendering them with rich. Amounts of money are strings with two decimals,
+as in the funds file.
+"""
+
+from decimal import Decimal
+
+from savingfunds.funds import (
+    FixedEndFund,
+    FundGroup,
+    ManualFund,
+    OpenEndFund,
+)
+from savingfunds.utils import moneyfmt
+
+
+def get_flat_funds_dict(funds):
+    return {f.key: f for f in funds.iter_funds()}
+
+
+def iter_flat_amounts(amounts):
+    """Iterate over (key, amount) in nested amounts of a distribution."""
+    stack = [iter(amounts.items())]
+    while len(stack) > 0:
+        item = next(stack[-1], None)
+        if item is None:
+            stack.pop()
+            continue
+
+        k, v = item
+        if type(v) is tuple:
+            amount, subamounts = v
+            yield k, amount
+            stack.append(iter(subamounts.items()))
+        else:
+            yield k, v
+
+
+def iter_funds_table_rows(funds):
+    """Iterate over the rows of the funds table, one per fund."""
+    for fund in funds.iter_funds():
+        yield {
+            "key": fund.key,
+            "name": fund.name,
+            "type": fund.get_type(),
+            "balance": moneyfmt(fund.balance),
+            "target": moneyfmt(fund.target),
+        }
+
+
+def iter_fund_tree_rows(funds):
+    """Iterate over the funds depth first with their parent and depth."""
+    for fund, parent, depth in funds.iter_funds(
+        with_parent=True, with_depth=True
+    ):
+        row = {
+            "key": fund.key,
+            "name": fund.name,
+            "type": fund.get_type(),
+            "parent": parent.key,
+            "depth": depth,
+            "balance": moneyfmt(fund.balance),
+            "target": None,
+        }
+        # As in the tree, manual funds and groups with them have no target.
+        if type(fund) is FundGroup:
+            if not fund.contains_manual_fund():
+                row["target"] = moneyfmt(fund.target)
+        elif type(fund) is not ManualFund:
+            row["target"] = moneyfmt(fund.target)
+        yield row
+
+
+def fund_details(fund):
+    details = {
+        "type": fund.get_type(),
+        "key": fund.key,
+        "name": fund.name,
+        "balance": moneyfmt(fund.balance),
+        "target": moneyfmt(fund.target),
+        "remainder": moneyfmt(fund.remainder_to_save()),
+    }
+    if isinstance(fund, FixedEndFund):
+        details["target_date"] = fund.target_date.isoformat()
+    elif isinstance(fund, OpenEndFund):
+        details["saving_days"] = fund.days
+    elif isinstance(fund, FundGroup):
+        details["contained_funds"] = len(fund.funds)
+
+    return details
+
+
+def account_details(account):
+    return {
+        "key": account.key,
+        "name": account.name,
+        "iban": account.iban,
+        "manual_funds": account.has_manual_funds(),
+        "minimal_balance": moneyfmt(account.get_minimal_balance()),
+        "comments": account.comments,
+        "funds": list(account.funds),
+    }
+
+
+def iter_account_rows(accounts):
+    """Iterate over the accounts with the keys of their funds."""
+    for account in accounts.values():
+        yield account_details(account)
+
+
+def monthly_amount(funds, year, month):
+    """The minimal monthly amount in total and per top-level fund."""
+    minimal_monthly_amounts = {
+        f: f.get_minimal_monthly_amount(year, month)
+        for f in funds.funds.values()
+    }
+
+    return {
+        "year": year,
+        "month": month,
+        "minimal_monthly_amount": moneyfmt(
+            sum(minimal_monthly_amounts.values(), Decimal(0))
+        ),
+        "tranches": [
+            {"key": f.key, "name": f.name, "amount": moneyfmt(v)}
+            for f, v in minimal_monthly_amounts.items()
+            if v > Decimal(0)
+        ],
+    }
+
+
+def iter_fund_amount_rows(funds, amounts):
+    """Iterate over the funds receiving a non-zero amount of a distribution."""
+    flat_funds = get_flat_funds_dict(funds)
+    for k, v in iter_flat_amounts(amounts):
+        if v == Decimal(0):
+            continue
+        yield {"key": k, "name": flat_funds[k].name, "amount": moneyfmt(v)}
+
+
+def iter_account_amount_rows(accounts, amounts):
+    """Iterate over the accounts with the increase of a distribution."""
+    fund_accounts = {
+        k: acct.key for acct in accounts.values() for k in acct.funds
+    }
+    acct_amounts = {k: Decimal(0) for k in accounts}
+    for k, v in iter_flat_amounts(amounts):
+        if k in fund_accounts:
+            acct_amounts[fund_accounts[k]] += v
+
+    for k, acct in accounts.items():
+        yield {
+            "key": k,
+            "name": acct.name,
+            "iban": acct.iban,
+            "comments": acct.comments,
+            "amount": moneyfmt(acct_amounts[k]),
+        }
+
+
+def distribution(funds, accounts, amount, remainder, amounts):
+    """The amounts of a distribution per fund and per account."""
+    return {
+        "amount": moneyfmt(amount),
+        "remainder": moneyfmt(remainder),
+        "funds": list(iter_fund_amount_rows(funds, amounts)),
+        "accounts": list(iter_account_amount_rows(accounts, amounts)),
+    }
+
+
+def iter_monthly_amount_rows(data):
+    """Iterate over the tranches and the total of a monthly amount."""
+    for row in data["tranches"]:
+        yield {"kind": "tranche", **row}
+    yield {
+        "kind": "total",
+        "key": "",
+        "name": "",
+        "amount": data["minimal_monthly_amount"],
+    }
+
+
+def iter_distribution_rows(data):
+    """Iterate over the funds, accounts and totals of a distribution."""
+    if "tranches" in data:
+        yield from iter_monthly_amount_rows(data)
+    for kind in ("funds", "accounts"):
+        for row in data[kind]:
+            yield {
+                "kind": kind[:-1],
+                "key": row["key"],
+                "name": row["name"],
+                "amount": row["amount"],
+            }
+    for kind in ("amount", "remainder", "deficit"):
+        if kind in data:
+            yield {"kind": kind, "key": "", "name": "", "amount": data[kind]}
@@ -14,28 +14,22 @@ from savingfunds.funds import (
     FundGroup,
     OpenEndFund,
 )
+from savingfunds.reportdata import (
+    get_flat_funds_dict,
+    iter_account_amount_rows,
+)
+from savingfunds.timings import timed
 from savingfunds.utils import moneyfmt
 
 
-def get_flat_funds_dict(funds):
-    flat_funds = {}
-    for k, f in funds.funds.items():
-        if type(f) is not FundGroup:
-            flat_funds[k] = f
-        else:
-            flat_funds[k] = f
-            sub_flat_funds = get_flat_funds_dict(f)
-            flat_funds = {**flat_funds, **sub_flat_funds}
-
-    return flat_funds
-
-
+@timed("render")
 def print_fund_tree(funds: dict[str, Fund]):
     fund_tree = funds.get_as_tree(None)
 
     print(fund_tree)
 
 
+@timed("render")
 def print_account_tree(accounts: dict[str, Account]):
     acct_tree = Tree("Accounts")
     for a in accounts.values():
@@ -44,6 +38,7 @@ def print_account_tree(accounts: dict[str, Account]):
     print(acct_tree)
 
 
+@timed("render")
 def print_funds_table(funds):
     table = Table(title="Funds")
 
@@ -67,6 +62,7 @@ def print_funds_table(funds):
     print(table)
 
 
+@timed("render")
 def print_savings_amounts_as_tree(funds, amounts):
     tree = tree_for_savings_amounts_as_tree(funds, amounts)
     print(tree)
@@ -96,6 +92,7 @@ def tree_for_savings_amounts_as_tree(funds, amounts):
     return tree
 
 
+@timed("render")
 def print_savings_amounts_for_accounts(accounts, amounts):
     tree = tree_for_savings_amounts_for_accounts(accounts, amounts)
     print(tree)
@@ -104,36 +101,19 @@ def print_savings_amounts_for_accounts(accounts, amounts):
 def tree_for_savings_amounts_for_accounts(accounts, amounts):
     tree = Tree("Root")
 
-    def flatten_amounts(amounts):
-        flat_amounts = {}
-        for k, v in amounts.items():
-            if type(v) is tuple:
-                amount, subamounts = v
-                flat_amounts[k] = amount
-                flat_subamounts = flatten_amounts(subamounts)
-                flat_amounts = {**flat_amounts, **flat_subamounts}
-            else:
-                flat_amounts[k] = v
-
-        return flat_amounts
-
-    flat_amounts = flatten_amounts(amounts)
-    for _, acct in accounts.items():
-        acct_amount = sum(
-            [v for k, v in flat_amounts.items() if k in acct.funds]
-        )
-
-        rows = [f"{acct.name}: € {moneyfmt(acct_amount)}."]
-        if acct.iban is not None:
-            rows.append(f"IBAN: {acct.get_iban_as_str()}")
-        if acct.comments != "":
-            rows.append(f"Comments: {acct.comments}")
+    for row in iter_account_amount_rows(accounts, amounts):
+        rows = [f"{row['name']}: € {row['amount']}."]
+        if row["iban"] is not None:
+            rows.append(f"IBAN: {row['iban']}")
+        if row["comments"] != "":
+            rows.append(f"Comments: {row['comments']}")
 
         tree.add(Group(*rows))
 
     return tree
 
 
+@timed("render")
 def print_savings_report(accounts, funds, amounts, info_contents):
     funds_tree = tree_for_savings_amounts_as_tree(funds, amounts)
     accounts_tree = tree_for_savings_amounts_for_accounts(accounts, amounts)
@@ -149,6 +129,7 @@ def print_savings_report(accounts, funds, amounts, info_contents):
     print(columns)
 
 
+@timed("render")
 def print_fund_details(fund):
     table = Table(title=f"Details on '{fund.name}'")
 
@@ -172,6 +153,7 @@ def print_fund_details(fund):
     print(table)
 
 
+@timed("render")
 def print_account_details(account):
     table = Table(title=f"Details of '{account.name}'")
 
@@ -0,0 +1,203 @@
+"""Serving the commands over a local Unix socket.
+
+A server loads the funds file once and runs the commands of its clients
+in-process on the objects in memory. Requests are handled one at a time, so
+mutations never interleave. Changes are saved after they have been left
+alone for a moment instead of after every command.
+
+Every connection carries a single request and its response, both a JSON
+object on a line. A request is either `{"args": ["deposit", "car", "10"]}`
+with the arguments of a command line or an operation like those of the
+batch command, e.g. `{"command": "deposit", "key": "car", "amount": "10"}`.
+The response is `{"exit_code": 0, "output": "..."}`.
+"""
+
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+import time
+import traceback
+
+import click
+
+# Commands that replace or bypass the objects of the server.
+EXCLUDED_COMMANDS = [
+    "serve",
+    "serve-api",
+    "init",
+    "import",
+    "batch",
+    "compact",
+]
+
+
+def get_socket_path(path):
+    return path.with_name(path.name + ".sock")
+
+
+class FundsServer(socketserver.UnixStreamServer):
+    """Server running commands of the `serve` context `ctx`.
+
+    Changes are saved once no other changes were made for `save_delay`
+    seconds, and when the server is closed.
+    """
+
+    def __init__(self, socket_path, ctx, save_delay):
+        self.ctx = ctx
+        self.save_delay = save_delay
+        self.changed_at = None
+        super().__init__(str(socket_path), RequestHandler)
+
+    def server_bind(self):
+        # Only the user running the server may connect.
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+
+    def run(self, request):
+        """Run the command of `request` and return the response."""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            try:
+                name, args = self.get_command_args(request)
+                command = self.ctx.parent.command.get_command(
+                    self.ctx.parent, name
+                )
+                if command is None or name in EXCLUDED_COMMANDS:
+                    raise click.UsageError(f"Unknown command '{name}'.")
+
+                with command.make_context(
+                    name, args, parent=self.ctx.parent
+                ) as sub_ctx:
+                    command.invoke(sub_ctx)
+                exit_code = 0
+            except click.ClickException as e:
+                e.show(file=output)
+                exit_code = e.exit_code
+            except click.exceptions.Exit as e:
+                exit_code = e.exit_code
+            except SystemExit as e:
+                exit_code = e.code if isinstance(e.code, int) else 1
+            except Exception:
+                traceback.print_exc(file=output)
+                exit_code = 1
+
+        if self.ctx.obj["UNSAVED"] and self.changed_at is None:
+            self.changed_at = time.monotonic()
+
+        return {"exit_code": exit_code, "output": output.getvalue()}
+
+    def get_command_args(self, request):
+        if "args" in request:
+            args = [str(a) for a in request["args"]]
+            if len(args) == 0:
+                raise click.UsageError("Missing command.")
+            return args[0], args[1:]
+
+        # Imported here, since it imports all mutating commands.
+        from savingfunds.commands.batch_commands import operation_args
+
+        operation = dict(request)
+        name = operation.pop("command", None)
+        if name is None:
+            raise click.UsageError("Missing command.")
+        command = self.ctx.parent.command.get_command(self.ctx.parent, name)
+        if command is None:
+            raise click.UsageError(f"Unknown command '{name}'.")
+
+        return name, operation_args(command, operation)
+
+    def service_actions(self):
+        if (
+            self.changed_at is not None
+            and time.monotonic() - self.changed_at >= self.save_delay
+        ):
+            self.try_save()
+
+    def try_save(self):
+        """Save the changes and return whether that succeeded.
+
+        A failure is reported on stderr and the changes are kept, so saving
+        them is tried again after the save delay.
+        """
+        try:
+            self.save()
+        except Exception as e:
+            click.echo(f"Could not save the changes: {e!r}", err=True)
+            self.changed_at = time.monotonic()
+            return False
+
+        return True
+
+    def save(self):
+        from savingfunds.commands.utils import save_changes
+
+        if not self.ctx.obj["UNSAVED"]:
+            return
+
+        self.ctx.obj["BATCH"] = False
+        try:
+            save_changes(self.ctx)
+        finally:
+            self.ctx.obj["BATCH"] = True
+        self.ctx.obj["UNSAVED"] = False
+        self.changed_at = None
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("The request is not a JSON object.")
+        except ValueError as e:
+            response = {"exit_code": 1, "output": f"Invalid request: {e}\n"}
+        else:
+            response = self.server.run(request)
+
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+def remove_stale_socket(socket_path):
+    """Remove a socket left behind by a server that did not shut down.
+
+    Raises `FileExistsError` when the path is not a socket or a server is
+    still listening on it.
+    """
+    try:
+        mode = os.stat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"'{socket_path}' exists and is not a socket.")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        try:
+            s.connect(str(socket_path))
+        except ConnectionRefusedError:
+            os.unlink(socket_path)
+            return
+
+    raise FileExistsError(f"A server is already listening on '{socket_path}'.")
+
+
+def send_command(socket_path, args):
+    """Run the command line `args` on the server at `socket_path`.
+
+    Returns the exit code and the output of the command.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(str(socket_path))
+        s.sendall(json.dumps({"args": list(args)}).encode() + b"\n")
+        with s.makefile("rb") as f:
+            response = json.loads(f.readline())
+
+    return response["exit_code"], response["output"]
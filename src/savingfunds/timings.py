@@ -0,0 +1,81 @@
+"""Timing of the phases of a command for the `--timings` option.
+
+Phases are timed with the `phase` context manager or the `timed` decorator,
+which do nothing unless timing was enabled with `enable_timings`. Phases can
+be nested and the time of a phase that runs more than once is accumulated.
+"""
+
+import functools
+import time
+from contextlib import contextmanager
+
+_timings = None
+
+
+class Timings:
+    def __init__(self):
+        # Accumulated seconds by the path of nested phase names, in the order
+        # in which the phases started.
+        self.totals = {}
+        self._path = ()
+
+    @contextmanager
+    def phase(self, name):
+        path = self._path + (name,)
+        self.totals.setdefault(path, 0.0)
+        self._path = path
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.totals[path] += time.perf_counter() - start
+            self._path = path[:-1]
+
+    def add(self, name, seconds):
+        path = self._path + (name,)
+        self.totals[path] = self.totals.get(path, 0.0) + seconds
+
+    def report(self):
+        width = max(
+            [2 * (len(p) - 1) + len(p[-1]) for p in self.totals], default=0
+        )
+        lines = []
+        for path, seconds in self.totals.items():
+            name = "  " * (len(path) - 1) + path[-1]
+            lines.append(f"{name:<{width}}  {seconds * 1000:9.1f} ms")
+
+        return "\n".join(lines)
+
+
+def enable_timings():
+    global _timings
+    _timings = Timings()
+
+    return _timings
+
+
+def get_timings():
+    return _timings
+
+
+@contextmanager
+def phase(name):
+    if _timings is None:
+        yield
+    else:
+        with _timings.phase(name):
+            yield
+
+
+def timed(name):
+    """Decorator timing every call of the function as phase `name`."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -2,41 +2,144 @@ import decimal
 from decimal import Decimal
 import random
 
+FILE_FORMATS = {".yaml": "yaml", ".yml": "yaml", ".json": "json"}
+
+
+def guess_file_format(path):
+    return FILE_FORMATS.get(path.suffix.lower(), "yaml")
+
+
+# Digits of the Decimal context of the tool. Amounts are kept to the cent
+# and rates are only compared and multiplied with amounts, so results do
+# not change with more digits; benchmarks/precision.py checks this.
+DECIMAL_PRECISION = 28
+
+ZERO = Decimal(0)
+CENT = Decimal("0.01")
+INFINITY = Decimal("Infinity")
+
+
+def to_cents(amount):
+    cents = amount * 100
+    if cents != cents.to_integral_value():
+        raise ValueError(f"Amount {amount} is not a whole number of cents.")
+
+    return int(cents)
+
+
+def from_cents(cents):
+    return Decimal(cents).scaleb(-2)
+
 
 def moneyfmt(value, places=2):
-    q = Decimal(10) ** -places
+    q = CENT if places == 2 else Decimal(10) ** -places
     return str(value.quantize(q, decimal.ROUND_HALF_UP))
 
 
 def dec_round(value, places=2):
-    q = Decimal(10) ** -places
+    q = CENT if places == 2 else Decimal(10) ** -places
     return value.quantize(q, decimal.ROUND_HALF_UP)
 
 
-def fix_overdistribution(amounts, amount, funds):
+# Random number generator for the legacy random rounding correction. The
+# largest remainder method is used when it is not set.
+_random = None
+
+
+def set_rounding_seed(seed):
+    """Use the legacy random rounding correction, seeded with `seed`.
+
+    Passing None restores the deterministic largest remainder method.
+    """
+    global _random
+    _random = None if seed is None else random.Random(seed)
+
+
+def fix_overdistribution(amounts, amount, funds, shares=None):
+    """Remove cents from the amounts of `funds` until they add up to `amount`.
+
+    The cents are removed from the funds whose amounts were rounded up the
+    most with respect to their exact `shares`, in the order of `funds` for
+    ties.
+    """
     amount_funds_left_sum = sum([amounts[k] for k in funds])
-    if amount_funds_left_sum > amount:
-        diff = amount_funds_left_sum - amount
-        # Remove cents from random funds until no difference is left.
-        for k in random.sample(funds, len(funds)):
-            if amounts[k] >= diff:
-                amounts[k] -= diff
+    if amount_funds_left_sum <= amount:
+        return amounts
+
+    diff = amount_funds_left_sum - amount
+    if _random is not None:
+        return _fix_overdistribution_randomly(amounts, diff, funds)
+
+    if shares is None:
+        shares = amounts
+    order = sorted(funds, key=lambda k: shares[k] - amounts[k])
+    cents, rest = divmod(diff, CENT)
+    cents = int(cents)
+    # The cents are taken in turns, one from every fund with a positive
+    # amount, so whole turns are taken at once until a fund runs out.
+    left = [k for k in order if amounts[k] > ZERO]
+    start = 0
+    while cents > 0 and len(left) > 0:
+        per_fund, extra = divmod(cents, len(left))
+        turns = min([per_fund] + [to_cents(amounts[k]) for k in left])
+        if turns == 0:
+            for k in left[:extra]:
+                amounts[k] -= CENT
+            start = extra
+            break
+
+        for k in left:
+            amounts[k] -= from_cents(turns)
+        cents -= turns * len(left)
+        left = [k for k in left if amounts[k] > ZERO]
+
+    # The part of a cent is taken from the fund whose turn is next.
+    after = left[start:] + [k for k in order if amounts[k] > ZERO]
+    if rest > 0 and len(after) > 0:
+        amounts[after[0]] -= rest
+
+    return amounts
+
+
+def _fix_overdistribution_randomly(amounts, diff, funds):
+    # Remove cents from random funds until no difference is left.
+    for k in _random.sample(funds, len(funds)):
+        if amounts[k] >= diff:
+            amounts[k] -= diff
+            break
+        else:
+            amounts[k] -= CENT
+            diff -= CENT
+            if diff == ZERO:
                 break
-            else:
-                amounts[k] -= Decimal("0.01")
-                diff -= Decimal("0.01")
-                if diff == Decimal(0):
-                    break
 
     return amounts
 
 
-def fix_underdistribution(amounts, amount, funds):
+def fix_underdistribution(amounts, amount, funds, shares=None):
+    """Add cents to the amounts of `funds` until they add up to `amount`.
+
+    The cents are added to the funds whose amounts were rounded down the most
+    with respect to their exact `shares`, in the order of `funds` for ties.
+    """
     amount_funds_left_sum = sum([amounts[k] for k in funds])
-    if amount > amount_funds_left_sum:
+    if amount <= amount_funds_left_sum or len(funds) == 0:
+        return amounts
+
+    diff = amount - amount_funds_left_sum
+    if _random is not None:
         # Find fund to deposit extra randomly.
-        diff = amount - amount_funds_left_sum
-        k = random.sample(funds, len(funds))[0]
+        k = _random.sample(funds, len(funds))[0]
         amounts[k] += diff
+        return amounts
+
+    if shares is None:
+        shares = amounts
+    order = sorted(funds, key=lambda k: amounts[k] - shares[k])
+    cents, rest = divmod(diff, CENT)
+    per_fund, extra = divmod(int(cents), len(order))
+    for i, k in enumerate(order):
+        amounts[k] += from_cents(per_fund + (1 if i < extra else 0))
+    amounts[order[0]] += rest
 
     return amounts